@@ -0,0 +1,303 @@
+"""
+Optional ASGI application whose polled JSON endpoints use ``redis.asyncio``.
+
+The Flask blueprint blocks a worker thread for every Redis round trip of a
+request. ``AsyncDashboard`` wraps the configured Flask app and answers the
+endpoints that every open tab keeps polling (``queues.json``, ``workers.json``
+and ``all/data/queues.json``) itself: their Redis calls are awaited, and the
+instances of the all-instances view are queried concurrently, so one process
+can serve many pollers. With shared snapshots enabled, they are served from
+the same snapshots as the Flask endpoints and only collected here when the
+snapshot is missing or stale. Basic auth and the other request hooks of the
+blueprint still run for those endpoints.
+
+Every other request (pages, job data, actions) is handed to the Flask app
+through asgiref's ``WsgiToAsgi``, installed with ``pip install
+rq-dashboard[asgi]``. Run it with any ASGI server, e.g.::
+
+    uvicorn --factory rq_dashboard.asgi:create_asgi_app
+
+"""
+import asyncio
+import io
+from functools import partial
+
+import redis.asyncio
+from redis.asyncio.sentinel import Sentinel
+from redis_sentinel_url import parse_sentinel_url
+from rq import Queue, Worker
+from rq.defaults import DEFAULT_FAILURE_TTL, DEFAULT_RESULT_TTL
+from rq.job import Job
+from rq.utils import as_text
+
+from .snapshots import get_snapshot_cache
+from .web import (
+    _redis_client_options,
+    _redis_pool_options,
+    get_redis_connection,
+    get_rate_ttls,
+    get_redis_urls,
+    get_serializer,
+    json_response,
+    parse_queue_heads,
+    parse_queue_stats,
+    parse_worker_hashes,
+    pipeline_queue_heads,
+    pipeline_queue_stats,
+    queues_collector,
+    serialize_all_queues,
+    serialize_queues,
+    serialize_workers,
+    snapshot_headers,
+    workers_collector,
+)
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:  # pragma: no cover
+    WsgiToAsgi = None
+
+
+def connect_async(app, instance_number):
+    """Return a ``redis.asyncio`` client for the given instance."""
+    redis_url = get_redis_urls(app)[instance_number]
+    client_options = _redis_client_options(app)
+    if not redis_url.startswith("redis+sentinel://"):
+        pool = redis.asyncio.BlockingConnectionPool.from_url(
+            redis_url, **client_options, **_redis_pool_options(app)
+        )
+        return redis.asyncio.Redis.from_pool(pool)
+
+    sentinel_url = parse_sentinel_url(
+        redis_url,
+        sentinel_options={"password": app.config.get("RQ_DASHBOARD_REDIS_SENTINEL_PASSWORD")},
+        client_options=client_options,
+    )
+    sentinel = Sentinel(
+        sentinel_url.hosts, sentinel_kwargs=sentinel_url.sentinel_options, **sentinel_url.client_options
+    )
+    if sentinel_url.default_client.type == "master":
+        return sentinel.master_for(sentinel_url.default_client.service)
+    return sentinel.slave_for(sentinel_url.default_client.service)
+
+
+async def collect_queues(connection, queue_connection, result_ttl=DEFAULT_RESULT_TTL,
+                         failure_ttl=DEFAULT_FAILURE_TTL):
+    """Async counterpart of ``web.collect_queues``.
+
+    ``queue_connection`` is the synchronous client the returned ``Queue``
+    objects are bound to; they are only used for their names.
+    """
+    prefix_length = len(Queue.redis_queue_namespace_prefix)
+    queue_names = sorted(
+        as_text(key)[prefix_length:] for key in await connection.smembers(Queue.redis_queues_keys)
+    )
+    async with connection.pipeline(transaction=False) as pipe:
+        pipeline_queue_stats(pipe, queue_names, result_ttl=result_ttl, failure_ttl=failure_ttl)
+        stats, heads = parse_queue_stats(queue_names, await pipe.execute())
+        if heads:
+            pipeline_queue_heads(pipe, heads)
+            parse_queue_heads(stats, heads, await pipe.execute())
+    queues = [Queue(name, connection=queue_connection) for name in queue_names]
+    return queues, stats
+
+
+async def collect_workers(connection, job_connection, serializer=None):
+    """Async counterpart of ``web.collect_workers``.
+
+    ``job_connection`` is the synchronous client the current jobs are bound
+    to; they are restored from their hashes, with ``serializer``, without
+    further Redis calls.
+    """
+    worker_keys = sorted(as_text(key) for key in await connection.smembers(Worker.redis_workers_keys))
+    async with connection.pipeline(transaction=False) as pipe:
+        for key in worker_keys:
+            pipe.hgetall(key)
+        workers = parse_worker_hashes(worker_keys, await pipe.execute())
+
+    current_job_ids = [fields["current_job"] for _, fields in workers if fields.get("current_job")]
+    async with connection.pipeline(transaction=False) as pipe:
+        for job_id in current_job_ids:
+            pipe.hgetall(Job.key_for(job_id))
+        raw_jobs = await pipe.execute()
+
+    current_jobs = {}
+    for job_id, raw_job in zip(current_job_ids, raw_jobs):
+        job = None
+        if raw_job:
+            job = Job(job_id, connection=job_connection, serializer=serializer)
+            job.restore(raw_job)
+        current_jobs[job_id] = job
+    return serialize_workers(workers, current_jobs)
+
+
+def wsgi_environ(scope, body=b""):
+    """Build the WSGI environ of an ASGI HTTP request, for Flask's request context."""
+    root_path = scope.get("root_path", "")
+    path = scope["path"]
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root_path,
+        "PATH_INFO": path,
+        "QUERY_STRING": as_text(scope.get("query_string", b"")),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": "HTTP/{}".format(scope.get("http_version", "1.1")),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": io.StringIO(),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name = as_text(name).upper().replace("-", "_")
+        value = as_text(value)
+        if name == "CONTENT_TYPE" or name == "CONTENT_LENGTH":
+            environ[name] = value
+        else:
+            key = "HTTP_{}".format(name)
+            environ[key] = "{},{}".format(environ[key], value) if key in environ else value
+    return environ
+
+
+class AsyncDashboard:
+    """ASGI application serving the polled endpoints of ``app`` with ``redis.asyncio``."""
+
+    def __init__(self, app):
+        self.app = app
+        self.connections = {}
+        self.handlers = {
+            "rq_dashboard.list_queues": self.list_queues,
+            "rq_dashboard.list_workers": self.list_workers,
+            "rq_dashboard.list_all_queues": self.list_all_queues,
+        }
+        self.fallback = WsgiToAsgi(app) if WsgiToAsgi is not None else None
+
+    def connection(self, instance_number):
+        if instance_number not in self.connections:
+            self.connections[instance_number] = connect_async(self.app, instance_number)
+        return self.connections[instance_number]
+
+    async def collect(self, instance_number, name, collect_now, collector):
+        """Return the ``name`` data of an instance and the age of its snapshot.
+
+        With snapshots enabled, a fresh snapshot is served as is and the
+        instance refresher keeps it fresh with the synchronous ``collector``;
+        a missing or stale one is replaced by awaiting ``collect_now()``. The
+        age is ``None`` when snapshots are disabled.
+        """
+        snapshots = get_snapshot_cache(self.app, partial(get_redis_connection, self.app))
+        if snapshots is None:
+            return await collect_now(), None
+        snapshots.register(instance_number, name, collector(self.app, instance_number))
+        snapshot = snapshots.peek(instance_number, name)
+        if snapshot is None:
+            snapshot = snapshots.store(instance_number, name, await collect_now())
+        return snapshot.value, snapshot.age
+
+    def collect_queues(self, instance_number):
+        return self.collect(
+            instance_number,
+            "queues",
+            partial(
+                collect_queues,
+                self.connection(instance_number),
+                get_redis_connection(self.app, instance_number),
+                **get_rate_ttls(self.app),
+            ),
+            queues_collector,
+        )
+
+    async def list_queues(self, instance_number):
+        (queues, stats), age = await self.collect_queues(instance_number)
+        return dict(queues=serialize_queues(instance_number, queues, stats)), snapshot_headers(age)
+
+    async def list_workers(self, instance_number):
+        workers, age = await self.collect(
+            instance_number,
+            "workers",
+            partial(
+                collect_workers,
+                self.connection(instance_number),
+                get_redis_connection(self.app, instance_number),
+                get_serializer(self.app, instance_number),
+            ),
+            workers_collector,
+        )
+        return dict(workers=workers), snapshot_headers(age)
+
+    async def list_all_queues(self):
+        timeout = float(self.app.config.get("RQ_DASHBOARD_INSTANCE_TIMEOUT", 2))
+        instance_numbers = range(len(get_redis_urls(self.app)))
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self.collect_queues(n), timeout) for n in instance_numbers),
+            return_exceptions=True,
+        )
+
+        def describe(result):
+            if isinstance(result, asyncio.TimeoutError):
+                return None, "No answer within {:g}s".format(timeout)
+            if isinstance(result, Exception):
+                return None, str(result) or type(result).__name__
+            return result[0], None
+
+        return serialize_all_queues((n,) + describe(result) for n, result in zip(instance_numbers, results))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "http" and await self.handle(scope, send):
+            return
+        elif self.fallback is not None:
+            await self.fallback(scope, receive, send)
+        else:
+            await send_response(
+                send, 501, [("Content-Type", "text/plain")], b"Install asgiref to serve this page."
+            )
+
+    async def handle(self, scope, send):
+        """Answer the request if it is for an async endpoint; return whether it was."""
+        with self.app.request_context(wsgi_environ(scope)) as ctx:
+            if ctx.request.routing_exception is not None or ctx.request.endpoint not in self.handlers:
+                return False
+            response = self.app.preprocess_request()
+            if response is None:
+                handler = self.handlers[ctx.request.endpoint]
+                response = json_response(await handler(**ctx.request.view_args))
+            response = self.app.process_response(self.app.make_response(response))
+            await send_response(send, response.status_code, response.headers.to_wsgi_list(), response.get_data())
+        return True
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for connection in self.connections.values():
+                    await connection.aclose()
+                self.connections.clear()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+async def send_response(send, status, headers, body):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def create_asgi_app():
+    """Create the dashboard as an ASGI application, configured like ``app.create_app``."""
+    from .app import create_app
+
+    return AsyncDashboard(create_app())
@@ -0,0 +1,94 @@
+"""Cursor (keyset) pagination of queues and registries.
+
+A cursor names the job a page starts or ends at, along with its position: its
+score in a registry, or its index in a queue. The neighbouring page is then
+read relative to that job rather than to an offset, so paging deep into a huge
+queue or registry costs the same as reading the first page, and rows are
+neither skipped nor repeated when jobs come and go in between.
+
+Queue indexes shift as jobs are dequeued (or enqueued at the front). The
+anchor job is first expected at its last known index, read by the same
+``LRANGE`` as the page, so a page of an unchanged queue costs one call of
+``count + 1`` ids. Only when the anchor moved is it found with ``LPOS``, which
+returns its new index without transferring the queue, and the page read again.
+
+"""
+from rq.utils import as_text
+
+AFTER = "after"
+BEFORE = "before"
+
+
+def encode_cursor(direction, position, job_id):
+    return "{}:{!r}:{}".format(direction, position, job_id)
+
+
+def decode_cursor(cursor):
+    """Return the ``(direction, position, job_id)`` of a cursor.
+
+    Raises ``ValueError`` for malformed cursors.
+    """
+    direction, position, job_id = cursor.split(":", 2)
+    if direction not in (AFTER, BEFORE) or not job_id:
+        raise ValueError("Invalid cursor: {}".format(cursor))
+    return direction, float(position), job_id
+
+
+def registry_page(connection, key, score, job_id, count, descending=False):
+    """Return up to ``count`` ``(job_id, score)`` entries following an anchor.
+
+    Entries come in score order (reversed when ``descending``), ties being
+    ordered by job id like Redis does. Only the entries sharing the anchor's
+    score are read twice, so the cost doesn't depend on how deep the anchor is.
+    """
+    entries = []
+    offset = 0
+    batch = count + 1
+    while len(entries) < count:
+        if descending:
+            raw = connection.zrevrangebyscore(key, score, "-inf", start=offset, num=batch, withscores=True)
+        else:
+            raw = connection.zrangebyscore(key, score, "+inf", start=offset, num=batch, withscores=True)
+        for member, member_score in raw:
+            member = as_text(member)
+            if member_score == score and (member >= job_id if descending else member <= job_id):
+                continue
+            entries.append((member, member_score))
+        if len(raw) < batch:
+            break
+        offset += batch
+    return entries[:count]
+
+
+def queue_page(connection, key, index, job_id, count, toward_head=False):
+    """Return up to ``count`` ``(job_id, index)`` entries following an anchor.
+
+    Entries go toward the tail of the queue, or toward its head when
+    ``toward_head``. If the anchor job left the queue, every job ahead of it
+    did too, so the page restarts from the head, or is empty toward the head.
+    """
+    index = int(index)
+    low = max(0, index - count) if toward_head else index
+    job_ids = [as_text(i) for i in connection.lrange(key, low, index if toward_head else index + count)]
+    if 0 <= index - low < len(job_ids) and job_ids[index - low] == job_id:
+        anchor = index
+    else:
+        anchor = connection.lpos(key, job_id)
+        if anchor is None:
+            if toward_head:
+                return []
+            return [(as_text(i), n) for n, i in enumerate(connection.lrange(key, 0, count - 1))]
+
+    if toward_head:
+        start, end = max(0, anchor - count), anchor - 1
+    else:
+        start, end = anchor + 1, anchor + count
+    if end < start:
+        return []
+    if anchor != index:
+        low = start
+        job_ids = [as_text(i) for i in connection.lrange(key, start, end)]
+    entries = [(job_ids[n - low], n) for n in range(start, min(end, low + len(job_ids) - 1) + 1)]
+    if toward_head:
+        entries.reverse()
+    return entries
@@ -0,0 +1,217 @@
+"""Time series of the job counts of every queue.
+
+When ``RQ_DASHBOARD_HISTORY_INTERVAL`` (seconds) is set, one background thread
+per Redis instance samples the counts shown on the queues page at that cadence.
+The last ``RQ_DASHBOARD_HISTORY_SIZE`` samples (360 by default) of each queue
+are kept in fixed-size, array-backed ring buffers, so memory use is bounded
+whatever the uptime.
+
+With ``RQ_DASHBOARD_HISTORY_PERSIST`` the samples are kept in Redis instead, as
+a list of packed records per queue trimmed to the same size. They then survive
+restarts and are shared by all dashboard processes, only one of which records
+each interval.
+
+"""
+import logging
+import struct
+import threading
+import time
+from array import array
+
+logger = logging.getLogger(__name__)
+
+_history_lock = threading.Lock()
+
+
+class RingBuffer:
+    """The latest ``capacity`` numbers appended, in a preallocated array."""
+
+    def __init__(self, typecode, capacity):
+        self.values = array(typecode, [0]) * capacity
+        self.capacity = capacity
+        self.start = 0
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def append(self, value):
+        self.values[(self.start + self.length) % self.capacity] = value
+        if self.length < self.capacity:
+            self.length += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def tolist(self):
+        """Return the values, oldest first."""
+        end = self.start + self.length
+        if end <= self.capacity:
+            return self.values[self.start:end].tolist()
+        return self.values[self.start:].tolist() + self.values[:end - self.capacity].tolist()
+
+
+class MemoryStorage:
+    """Samples kept in the ring buffers of this process."""
+
+    def __init__(self, fields, size):
+        self.fields = fields
+        self.size = size
+        self.buffers = {}
+        self.lock = threading.Lock()
+
+    def claim(self, connection, interval):
+        return True
+
+    def record(self, connection, instance_number, timestamp, stats):
+        with self.lock:
+            for queue_name, counts in stats.items():
+                buffers = self.buffers.get((instance_number, queue_name))
+                if buffers is None:
+                    buffers = self.buffers[(instance_number, queue_name)] = [RingBuffer("d", self.size)] + [
+                        RingBuffer("q", self.size) for _ in self.fields
+                    ]
+                buffers[0].append(timestamp)
+                for buffer, field in zip(buffers[1:], self.fields):
+                    buffer.append(counts[field])
+
+    def read(self, connection, instance_number, queue_name):
+        return self.read_many(connection, instance_number, [queue_name])[queue_name]
+
+    def read_many(self, connection, instance_number, queue_names):
+        columns = {}
+        with self.lock:
+            for queue_name in queue_names:
+                buffers = self.buffers.get((instance_number, queue_name))
+                if buffers is None:
+                    columns[queue_name] = [[] for _ in range(len(self.fields) + 1)]
+                else:
+                    columns[queue_name] = [buffer.tolist() for buffer in buffers]
+        return columns
+
+
+class RedisStorage:
+    """Samples kept in Redis, one list of packed records per queue."""
+
+    # The lists live in their own namespace so that no queue name, not even
+    # "claim", can collide with the lock of the sampling interval.
+    key_template = "rq_dashboard:history:queue:{0}"
+    claim_key = "rq_dashboard:history:claim"
+
+    def __init__(self, fields, size, interval):
+        self.fields = fields
+        self.size = size
+        self.ttl = int(size * interval) + 1
+        self.record_format = struct.Struct("<d{}q".format(len(fields)))
+
+    def claim(self, connection, interval):
+        """Tell whether this process records the current interval."""
+        return bool(connection.set(self.claim_key, 1, nx=True, px=max(1, int(interval * 900))))
+
+    def record(self, connection, instance_number, timestamp, stats):
+        with connection.pipeline(transaction=False) as pipe:
+            for queue_name, counts in stats.items():
+                key = self.key_template.format(queue_name)
+                pipe.rpush(key, self.record_format.pack(timestamp, *(counts[field] for field in self.fields)))
+                pipe.ltrim(key, -self.size, -1)
+                pipe.expire(key, self.ttl)
+            pipe.execute()
+
+    def read(self, connection, instance_number, queue_name):
+        return self.unpack(connection.lrange(self.key_template.format(queue_name), 0, -1))
+
+    def read_many(self, connection, instance_number, queue_names):
+        """Read the samples of all ``queue_names`` in one pipelined round trip."""
+        with connection.pipeline(transaction=False) as pipe:
+            for queue_name in queue_names:
+                pipe.lrange(self.key_template.format(queue_name), 0, -1)
+            results = pipe.execute()
+        return {queue_name: self.unpack(records) for queue_name, records in zip(queue_names, results)}
+
+    def unpack(self, records):
+        columns = [[] for _ in range(len(self.fields) + 1)]
+        for record in self.record_format.iter_unpack(b"".join(records)):
+            for column, value in zip(columns, record):
+                column.append(value)
+        return columns
+
+
+class HistorySampler(threading.Thread):
+    """Background thread sampling the queue counts of one instance."""
+
+    def __init__(self, history, instance_number):
+        super().__init__(name="rq-dashboard-history-{}".format(instance_number), daemon=True)
+        self.history = history
+        self.instance_number = instance_number
+        self.stopped = threading.Event()
+
+    def run(self):
+        while True:
+            try:
+                self.history.sample(self.instance_number)
+            except Exception:
+                logger.exception("Could not sample the queues of instance %s", self.instance_number)
+            if self.stopped.wait(self.history.interval):
+                return
+
+
+class QueueHistory:
+    """Counts of ``fields`` for every queue, sampled every ``interval`` seconds.
+
+    ``collect`` is called with an instance number and returns the counts of
+    every queue of that instance, like ``web.collect_queue_stats``.
+    """
+
+    def __init__(self, connect, collect, fields, interval, size=360, persist=False):
+        self.connect = connect
+        self.collect = collect
+        self.fields = tuple(fields)
+        self.interval = interval
+        self.storage = RedisStorage(self.fields, size, interval) if persist else MemoryStorage(self.fields, size)
+        self.samplers = {}
+
+    def start(self, instance_numbers):
+        for instance_number in instance_numbers:
+            if instance_number not in self.samplers:
+                sampler = self.samplers[instance_number] = HistorySampler(self, instance_number)
+                sampler.start()
+
+    def sample(self, instance_number):
+        connection = self.connect(instance_number)
+        if self.storage.claim(connection, self.interval):
+            self.storage.record(connection, instance_number, time.time(), self.collect(instance_number))
+
+    def read(self, instance_number, queue_name):
+        """Return the sample times of a queue and the series of each field, oldest first."""
+        columns = self.storage.read(self.connect(instance_number), instance_number, queue_name)
+        return columns[0], dict(zip(self.fields, columns[1:]))
+
+    def read_many(self, instance_number, queue_names):
+        """Return ``read`` of every queue of ``queue_names``, by queue name, in one round trip."""
+        columns = self.storage.read_many(self.connect(instance_number), instance_number, queue_names)
+        return {queue_name: (value[0], dict(zip(self.fields, value[1:]))) for queue_name, value in columns.items()}
+
+    def stop(self):
+        for sampler in self.samplers.values():
+            sampler.stopped.set()
+
+
+def get_queue_history(app, connect, collect, fields, instance_numbers):
+    """Return the app's ``QueueHistory``, started, or ``None`` when disabled."""
+    interval = app.config.get("RQ_DASHBOARD_HISTORY_INTERVAL")
+    if not interval or float(interval) <= 0:
+        return None
+    history = getattr(app, "rq_queue_history", None)
+    if history is None:
+        with _history_lock:
+            history = getattr(app, "rq_queue_history", None)
+            if history is None:
+                history = app.rq_queue_history = QueueHistory(
+                    connect,
+                    collect,
+                    fields,
+                    float(interval),
+                    size=int(app.config.get("RQ_DASHBOARD_HISTORY_SIZE", 360)),
+                    persist=bool(app.config.get("RQ_DASHBOARD_HISTORY_PERSIST")),
+                )
+                history.start(instance_numbers)
+    return history
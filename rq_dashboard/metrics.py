@@ -0,0 +1,123 @@
+"""Prometheus metrics of every configured instance.
+
+``/metrics`` exposes the counts of the queues page and the states and counters
+of the workers page in the Prometheus text format. They come from the same
+collectors as ``queues.json`` and ``workers.json``, shared snapshots included.
+
+The page is collected at most once every ``RQ_DASHBOARD_METRICS_MIN_INTERVAL``
+seconds (10 by default). Scrapes in between get the cached page, and scrapes
+arriving during a collection wait for it, so adding scrapers doesn't add Redis
+traffic.
+
+"""
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_cache_lock = threading.Lock()
+
+
+def format_labels(labels):
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(int(value))
+
+
+def render_metrics(queue_results, worker_results):
+    """Render the metrics page.
+
+    ``queue_results`` holds ``(instance_number, stats, error)`` tuples, stats
+    mapping queue names to their counts like ``collect_queue_stats``, and
+    ``worker_results`` ``(instance_number, workers, error)`` tuples of
+    serialized workers.
+    """
+    lines = []
+
+    def family(name, kind, description, samples):
+        lines.append("# HELP {} {}".format(name, description))
+        lines.append("# TYPE {} {}".format(name, kind))
+        for labels, value in samples:
+            lines.append("{}{} {}".format(name, format_labels(labels), format_value(value)))
+
+    queue_results = list(queue_results)
+    worker_results = list(worker_results)
+    errors = {}
+    for instance_number, _, error in queue_results + worker_results:
+        errors[instance_number] = errors.get(instance_number) or error
+
+    family(
+        "rq_up",
+        "gauge",
+        "Whether the Redis instance answered the last collection.",
+        [((("rq_instance", n),), 0 if error else 1) for n, error in sorted(errors.items())],
+    )
+
+    jobs = []
+    for instance_number, stats, _ in queue_results:
+        for queue_name, counts in sorted((stats or {}).items()):
+            for field, value in counts.items():
+                if field != "count" and not field.endswith("_job_registry_count"):
+                    continue
+                registry = "queued" if field == "count" else field[: -len("_job_registry_count")]
+                labels = (("rq_instance", instance_number), ("queue", queue_name), ("registry", registry))
+                jobs.append((labels, value))
+    family("rq_jobs", "gauge", "Number of jobs in a queue or one of its registries.", jobs)
+
+    states = []
+    successful = []
+    failed = []
+    working_time = []
+    for instance_number, workers, _ in worker_results:
+        counts = {}
+        for worker in workers or []:
+            counts[worker["state"]] = counts.get(worker["state"], 0) + 1
+            labels = (
+                ("rq_instance", instance_number),
+                ("worker", worker["name"]),
+                ("queues", ",".join(worker["queues"])),
+            )
+            successful.append((labels, worker["successful_job_count"]))
+            failed.append((labels, worker["failed_job_count"]))
+            working_time.append((labels, worker["total_working_time"]))
+        states.extend(
+            ((("rq_instance", instance_number), ("state", state)), count) for state, count in sorted(counts.items())
+        )
+    family("rq_workers", "gauge", "Number of workers in each state.", states)
+    family("rq_worker_successful_jobs_total", "counter", "Jobs a worker finished successfully.", successful)
+    family("rq_worker_failed_jobs_total", "counter", "Jobs that failed in a worker.", failed)
+    family("rq_worker_working_seconds_total", "counter", "Time a worker spent working on jobs.", working_time)
+    return "\n".join(lines) + "\n"
+
+
+class MetricsCache:
+    """The last rendered metrics page, collected again once ``min_interval`` elapsed."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.page = None
+        self.collected_at = None
+
+    def get(self, collect):
+        """Return the page and its age in seconds, calling ``collect`` if it is too old."""
+        with self.lock:
+            if self.page is None or time.monotonic() - self.collected_at >= self.min_interval:
+                self.page = collect()
+                self.collected_at = time.monotonic()
+            return self.page, time.monotonic() - self.collected_at
+
+
+def get_metrics_cache(app):
+    with _cache_lock:
+        cache = getattr(app, "rq_metrics", None)
+        if cache is None:
+            min_interval = float(app.config.get("RQ_DASHBOARD_METRICS_MIN_INTERVAL", 10))
+            cache = app.rq_metrics = MetricsCache(min_interval)
+    return cache
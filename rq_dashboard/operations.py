@@ -0,0 +1,149 @@
+"""Long-running maintenance operations run in the background.
+
+Emptying, compacting or requeueing a large queue can take longer than a proxy
+or Gunicorn allows a request to last. Those operations are therefore run by a
+small thread pool (``RQ_DASHBOARD_OPERATION_WORKERS`` threads, 2 by default)
+and the request only returns the id of the operation.
+
+Progress is kept in a Redis hash of the instance the operation works on, so
+any dashboard process can report it, and expires ``RQ_DASHBOARD_OPERATION_TTL``
+seconds (an hour by default) after the last update. Besides the number of jobs
+processed, an operation can count their outcomes, e.g. how many jobs were
+requeued and how many were skipped.
+
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+_executor_lock = threading.Lock()
+
+
+class Operation:
+    key_template = "rq_dashboard:operation:{0}"
+    outcome_prefix = "outcome:"
+
+    def __init__(self, connection, name, total, ttl=3600, id=None):
+        self.connection = connection
+        self.id = id or uuid.uuid4().hex
+        self.name = name
+        self.total = total
+        self.ttl = ttl
+        self.status = "pending"
+        self.processed = 0
+        self.outcomes = {}
+        self.started_at = None
+        self.ended_at = None
+        self.error = None
+
+    @property
+    def key(self):
+        return self.key_template.format(self.id)
+
+    def save(self):
+        mapping = dict(
+            name=self.name,
+            status=self.status,
+            processed=self.processed,
+            total=self.total,
+            started_at=self.started_at or "",
+            ended_at=self.ended_at or "",
+            error=self.error or "",
+        )
+        for outcome, count in self.outcomes.items():
+            mapping[self.outcome_prefix + outcome] = count
+        with self.connection.pipeline() as pipe:
+            pipe.hset(self.key, mapping=mapping)
+            pipe.expire(self.key, self.ttl)
+            pipe.execute()
+
+    def run(self, steps):
+        """Consume ``steps``, an iterable of processed item counts, saving progress.
+
+        A step may also be a dict counting the items of each outcome, which
+        are then processed items too.
+        """
+        self.status = "running"
+        self.started_at = time.time()
+        self.save()
+        try:
+            for processed in steps:
+                if isinstance(processed, dict):
+                    for outcome, count in processed.items():
+                        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + count
+                    processed = sum(processed.values())
+                self.processed += processed
+                self.save()
+        except Exception as e:
+            logger.exception("Operation %s (%s) failed", self.id, self.name)
+            self.status = "failed"
+            self.error = str(e)
+        else:
+            self.status = "finished"
+        self.ended_at = time.time()
+        self.save()
+
+    @classmethod
+    def fetch(cls, connection, id):
+        """Return the operation with the given id, or ``None`` once expired."""
+        raw = connection.hgetall(cls.key_template.format(id))
+        if not raw:
+            return None
+        raw = {k.decode(): v.decode() for k, v in raw.items()}
+        operation = cls(connection, raw["name"], int(raw["total"]), id=id)
+        operation.status = raw["status"]
+        operation.processed = int(raw["processed"])
+        operation.started_at = float(raw["started_at"]) if raw["started_at"] else None
+        operation.ended_at = float(raw["ended_at"]) if raw["ended_at"] else None
+        operation.error = raw["error"] or None
+        operation.outcomes = {
+            k[len(cls.outcome_prefix):]: int(v) for k, v in raw.items() if k.startswith(cls.outcome_prefix)
+        }
+        return operation
+
+    def to_dict(self):
+        rate = eta = None
+        if self.started_at is not None:
+            elapsed = (self.ended_at or time.time()) - self.started_at
+            if elapsed > 0 and self.processed:
+                rate = self.processed / elapsed
+                eta = max(self.total - self.processed, 0) / rate
+        return dict(
+            id=self.id,
+            name=self.name,
+            status=self.status,
+            processed=self.processed,
+            outcomes=self.outcomes,
+            total=self.total,
+            rate=rate,
+            eta=eta,
+            error=self.error,
+        )
+
+
+def get_executor(app):
+    with _executor_lock:
+        executor = getattr(app, "rq_operations_executor", None)
+        if executor is None:
+            workers = int(app.config.get("RQ_DASHBOARD_OPERATION_WORKERS", 2))
+            executor = app.rq_operations_executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="rq-dashboard-operation"
+            )
+    return executor
+
+
+def start_operation(app, connection, name, total, steps):
+    """Run ``steps`` in the background and return the pending ``Operation``.
+
+    ``steps`` is consumed lazily by the worker thread, so generators only
+    start touching Redis once the operation runs.
+    """
+    ttl = int(app.config.get("RQ_DASHBOARD_OPERATION_TTL", 3600))
+    operation = Operation(connection, name, total, ttl=ttl)
+    operation.save()
+    get_executor(app).submit(operation.run, steps)
+    return operation
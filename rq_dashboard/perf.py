@@ -0,0 +1,192 @@
+"""Per-request timing of Redis calls, serialization and rendering.
+
+With ``RQ_DASHBOARD_PERF`` set, the Redis clients of the instances are
+instrumented to count the commands and round trips of every request and the
+time spent waiting for them. Along with the time taken to serialize the JSON
+payloads and to render the templates, they are sent in a ``Server-Timing``
+header, which browser developer tools show next to the request, and aggregated
+per route into latency histograms served from
+``/<instance_number>/data/_perf.json``.
+
+Only calls made by the request's own thread are counted; collections run by
+the snapshot refreshers or the all-instances thread pool are not.
+
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds, in milliseconds, of the histogram buckets; the last bucket is unbounded.
+BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+PHASES = ("redis", "serialize", "render")
+
+_current = contextvars.ContextVar("rq_dashboard_request_timings", default=None)
+_recorder_lock = threading.Lock()
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.commands = 0
+        self.round_trips = 0
+        self.durations = dict.fromkeys(PHASES, 0.0)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self, total):
+        """Return the ``Server-Timing`` header value, durations in milliseconds."""
+        entries = [
+            'redis;dur={:.2f};desc="{} commands, {} round trips"'.format(
+                self.durations["redis"] * 1000, self.commands, self.round_trips
+            )
+        ]
+        for phase in PHASES[1:]:
+            if self.durations[phase]:
+                entries.append("{};dur={:.2f}".format(phase, self.durations[phase] * 1000))
+        entries.append("total;dur={:.2f}".format(total * 1000))
+        return ", ".join(entries)
+
+
+def start_request():
+    """Start timing the current request and return its ``RequestTimings``."""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def end_request():
+    """Stop timing the current request and return its ``RequestTimings``, if it was timed."""
+    timings = _current.get()
+    _current.set(None)
+    return timings
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to ``phase`` of the current request, if timed."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[phase] += time.perf_counter() - started_at
+
+
+def instrument(client):
+    """Make ``client`` count its commands, round trips and time into the current request.
+
+    Single commands are one round trip each; a pipeline is one round trip for
+    all of its commands. Returns ``client``.
+    """
+    execute_command = client.execute_command
+    make_pipeline = client.pipeline
+
+    def counted_execute_command(*args, **options):
+        timings = _current.get()
+        if timings is None:
+            return execute_command(*args, **options)
+        started_at = time.perf_counter()
+        try:
+            return execute_command(*args, **options)
+        finally:
+            timings.durations["redis"] += time.perf_counter() - started_at
+            timings.commands += 1
+            timings.round_trips += 1
+
+    def counted_pipeline(*args, **kwargs):
+        pipe = make_pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        def counted_execute(*execute_args, **execute_kwargs):
+            timings = _current.get()
+            commands = len(pipe.command_stack)
+            if timings is None or not commands:
+                return execute(*execute_args, **execute_kwargs)
+            started_at = time.perf_counter()
+            try:
+                return execute(*execute_args, **execute_kwargs)
+            finally:
+                timings.durations["redis"] += time.perf_counter() - started_at
+                timings.commands += commands
+                timings.round_trips += 1
+
+        pipe.execute = counted_execute
+        return pipe
+
+    client.execute_command = counted_execute_command
+    client.pipeline = counted_pipeline
+    return client
+
+
+class RouteStats:
+    def __init__(self):
+        self.count = 0
+        self.histogram = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.commands = 0
+        self.round_trips = 0
+        self.durations = dict.fromkeys(PHASES, 0.0)
+
+    def add(self, timings, total):
+        self.count += 1
+        self.histogram[bisect.bisect_left(BUCKETS, total * 1000)] += 1
+        self.total += total
+        self.commands += timings.commands
+        self.round_trips += timings.round_trips
+        for phase in PHASES:
+            self.durations[phase] += timings.durations[phase]
+
+    def to_dict(self):
+        result = dict(
+            count=self.count,
+            histogram=self.histogram,
+            mean_ms=1000 * self.total / self.count,
+            mean_commands=self.commands / self.count,
+            mean_round_trips=self.round_trips / self.count,
+        )
+        for phase in PHASES:
+            result["mean_{}_ms".format(phase)] = 1000 * self.durations[phase] / self.count
+        return result
+
+
+class PerfRecorder:
+    """Timings of the requests served by this process, per instance and route."""
+
+    def __init__(self):
+        self.routes = {}
+        self.lock = threading.Lock()
+
+    def record(self, instance_number, route, timings, total):
+        with self.lock:
+            stats = self.routes.get((instance_number, route))
+            if stats is None:
+                stats = self.routes[(instance_number, route)] = RouteStats()
+            stats.add(timings, total)
+
+    def to_dict(self, instance_number):
+        with self.lock:
+            routes = {
+                route: stats.to_dict()
+                for (number, route), stats in sorted(self.routes.items())
+                if number == instance_number
+            }
+        return dict(buckets_ms=list(BUCKETS) + ["+Inf"], routes=routes)
+
+
+def perf_enabled(app):
+    return bool(app.config.get("RQ_DASHBOARD_PERF"))
+
+
+def get_recorder(app):
+    with _recorder_lock:
+        recorder = getattr(app, "rq_perf", None)
+        if recorder is None:
+            recorder = app.rq_perf = PerfRecorder()
+    return recorder
@@ -0,0 +1,46 @@
+"""Cache of the previews of job results shown by the job page.
+
+A result is stored once and never changes, so the preview of a result, the
+start of its JSON text along with its full size, is computed the first time
+the job page asks for it and kept under the result's id. Polling a finished
+job with a large return value then doesn't deserialize and re-encode it every
+time. The latest ``RQ_DASHBOARD_PREVIEW_CACHE_SIZE`` previews (256 by default)
+are kept per process.
+
+"""
+import threading
+from collections import OrderedDict
+
+_cache_lock = threading.Lock()
+
+
+class PreviewCache:
+    """Least recently used previews, keyed by instance, job, result id and preview size."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.previews = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, compute):
+        """Return the preview of ``key``, calling ``compute()`` for it if it isn't cached."""
+        with self.lock:
+            preview = self.previews.get(key)
+            if preview is not None:
+                self.previews.move_to_end(key)
+                return preview
+        preview = compute()
+        with self.lock:
+            self.previews[key] = preview
+            while len(self.previews) > self.max_size:
+                self.previews.popitem(last=False)
+        return preview
+
+
+def get_preview_cache(app):
+    """Return the app's ``PreviewCache``."""
+    with _cache_lock:
+        cache = getattr(app, "rq_previews", None)
+        if cache is None:
+            cache = app.rq_previews = PreviewCache(int(app.config.get("RQ_DASHBOARD_PREVIEW_CACHE_SIZE", 256)))
+    return cache
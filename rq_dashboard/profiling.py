@@ -0,0 +1,162 @@
+"""Profiling of single requests, for diagnosing slow pages in production.
+
+Profiling is off unless ``RQ_DASHBOARD_PROFILING_TOKEN`` is set. A request
+carrying that token, in an ``X-Profile-Token`` header or a ``profile`` query
+argument, is then run under cProfile, and its response names the stored
+profile in ``X-Profile-Id`` and ``X-Profile-Url``. Other requests are not
+slowed down, and only one request per process is profiled at a time; others
+are served unprofiled.
+
+Profiles are kept in a Redis hash of the instance the request was for, so any
+dashboard process can serve them. Each expires ``RQ_DASHBOARD_PROFILING_TTL``
+seconds (an hour by default) after it was taken. Only the latest
+``RQ_DASHBOARD_PROFILING_KEEP`` (20 by default) are kept.
+
+"""
+import cProfile
+import hmac
+import io
+import marshal
+import pstats
+import threading
+import time
+import uuid
+
+_profiling_lock = threading.Lock()
+
+
+def profiling_token(app):
+    """Return the token requests need to be profiled, or ``None`` when profiling is off."""
+    return app.config.get("RQ_DASHBOARD_PROFILING_TOKEN") or None
+
+
+def token_matches(app, token):
+    expected = profiling_token(app)
+    return expected is not None and token is not None and hmac.compare_digest(str(token), str(expected))
+
+
+class RequestProfiler:
+    """cProfile running around one request, holding the process-wide profiling slot."""
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.started_at = None
+
+    @classmethod
+    def start(cls):
+        """Start profiling, or return ``None`` if another request is being profiled."""
+        if not _profiling_lock.acquire(blocking=False):
+            return None
+        try:
+            request_profiler = cls()
+            request_profiler.started_at = time.perf_counter()
+            request_profiler.profiler.enable()
+        except Exception:
+            _profiling_lock.release()
+            raise
+        return request_profiler
+
+    def stop(self):
+        """Stop profiling and return the collected ``pstats`` data and the duration."""
+        try:
+            self.profiler.disable()
+            duration = time.perf_counter() - self.started_at
+            self.profiler.create_stats()
+            return self.profiler.stats, duration
+        finally:
+            _profiling_lock.release()
+
+
+class Profile:
+    key_template = "rq_dashboard:profile:{0}"
+    index_key = "rq_dashboard:profiles"
+
+    def __init__(self, endpoint, path, duration, stats, created_at=None, id=None):
+        self.id = id or uuid.uuid4().hex
+        self.endpoint = endpoint
+        self.path = path
+        self.duration = duration
+        self.stats = stats
+        self.created_at = created_at or time.time()
+
+    @property
+    def key(self):
+        return self.key_template.format(self.id)
+
+    def save(self, connection, ttl=3600, keep=20):
+        """Store the profile, dropping the profiles beyond the latest ``keep``."""
+        with connection.pipeline() as pipe:
+            pipe.hset(
+                self.key,
+                mapping=dict(
+                    endpoint=self.endpoint or "",
+                    path=self.path,
+                    duration=self.duration,
+                    created_at=self.created_at,
+                    stats=marshal.dumps(self.stats),
+                ),
+            )
+            pipe.expire(self.key, ttl)
+            pipe.lpush(self.index_key, self.id)
+            pipe.lrange(self.index_key, keep, -1)
+            pipe.ltrim(self.index_key, 0, keep - 1)
+            pipe.expire(self.index_key, ttl)
+            dropped = pipe.execute()[3]
+        if dropped:
+            connection.delete(*(self.key_template.format(i.decode()) for i in dropped))
+
+    @classmethod
+    def fetch(cls, connection, id):
+        """Return the profile with the given id, or ``None`` once expired or dropped."""
+        raw = connection.hgetall(cls.key_template.format(id))
+        if not raw:
+            return None
+        return cls(
+            raw[b"endpoint"].decode() or None,
+            raw[b"path"].decode(),
+            float(raw[b"duration"]),
+            marshal.loads(raw[b"stats"]),
+            created_at=float(raw[b"created_at"]),
+            id=id,
+        )
+
+    @classmethod
+    def list(cls, connection):
+        """Return the stored profiles, latest first, without their stats."""
+        ids = [i.decode() for i in connection.lrange(cls.index_key, 0, -1)]
+        with connection.pipeline(transaction=False) as pipe:
+            for id in ids:
+                pipe.hmget(cls.key_template.format(id), "endpoint", "path", "duration", "created_at")
+            rows = pipe.execute()
+        return [
+            dict(
+                id=id,
+                endpoint=endpoint.decode() or None,
+                path=path.decode(),
+                duration=float(duration),
+                created_at=float(created_at),
+            )
+            for id, (endpoint, path, duration, created_at) in zip(ids, rows)
+            if path is not None
+        ]
+
+    def dump(self):
+        """Return the profile in the format of ``pstats.Stats.dump_stats``."""
+        return marshal.dumps(self.stats)
+
+    def summary(self, limit=60):
+        """Return the ``limit`` functions with the highest cumulative time, as text."""
+        out = io.StringIO()
+        stats = pstats.Stats(_StatsHolder(self.stats), stream=out)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+
+class _StatsHolder:
+    """What ``pstats.Stats`` needs to load already collected stats."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
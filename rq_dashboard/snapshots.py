@@ -0,0 +1,123 @@
+"""Shared snapshots of the data behind the polled JSON endpoints.
+
+When ``RQ_DASHBOARD_SNAPSHOT_INTERVAL`` (milliseconds) is set, the data of
+``queues.json`` and ``workers.json`` is collected by one background thread per
+Redis instance at that cadence and every request is answered from the latest
+snapshot. Redis load then depends on the interval only, not on how many
+browsers are polling.
+
+A snapshot older than ``RQ_DASHBOARD_SNAPSHOT_MAX_STALENESS`` milliseconds
+(five intervals by default), e.g. because the refresher keeps failing, is
+recomputed in the request instead of being served.
+
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_cache_lock = threading.Lock()
+
+
+class Snapshot:
+    def __init__(self, value, taken_at):
+        self.value = value
+        self.taken_at = taken_at
+
+    @property
+    def age(self):
+        """Seconds elapsed since the snapshot was taken."""
+        return time.monotonic() - self.taken_at
+
+
+class InstanceRefresher(threading.Thread):
+    """Background thread that keeps the snapshots of one instance fresh."""
+
+    def __init__(self, snapshots, instance_number):
+        super().__init__(name="rq-dashboard-snapshots-{}".format(instance_number), daemon=True)
+        self.snapshots = snapshots
+        self.instance_number = instance_number
+        self.collectors = {}
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.snapshots.interval):
+            for name, collect in list(self.collectors.items()):
+                try:
+                    self.snapshots.refresh(self.instance_number, name, collect)
+                except Exception:
+                    logger.exception(
+                        "Could not refresh %s snapshot of instance %s", name, self.instance_number
+                    )
+
+
+class SnapshotCache:
+    """In-memory snapshots keyed by instance number and payload name."""
+
+    def __init__(self, connect, interval, max_staleness=None):
+        self.connect = connect
+        self.interval = interval
+        self.max_staleness = max_staleness if max_staleness is not None else 5 * interval
+        self.snapshots = {}
+        self.refreshers = {}
+        self.lock = threading.Lock()
+
+    def refresh(self, instance_number, name, collect, connect=None):
+        return self.store(instance_number, name, collect((connect or self.connect)(instance_number)))
+
+    def store(self, instance_number, name, value):
+        """Make ``value``, collected just now, the snapshot of ``name``."""
+        snapshot = Snapshot(value, time.monotonic())
+        self.snapshots[(instance_number, name)] = snapshot
+        return snapshot
+
+    def register(self, instance_number, name, collect):
+        """Have the instance refresher keep ``name`` fresh with ``collect``."""
+        refresher = self.refreshers.get(instance_number)
+        if refresher is None or name not in refresher.collectors:
+            with self.lock:
+                refresher = self.refreshers.get(instance_number)
+                if refresher is None:
+                    refresher = self.refreshers[instance_number] = InstanceRefresher(self, instance_number)
+                    refresher.start()
+                refresher.collectors.setdefault(name, collect)
+
+    def get(self, instance_number, name, collect, connect=None):
+        """Return the snapshot of ``name``, collecting it now if missing or too stale.
+
+        ``collect`` is called with the instance's Redis connection and is
+        registered with the instance refresher on first use. A collection
+        made now connects with ``connect`` when given.
+        """
+        self.register(instance_number, name, collect)
+        snapshot = self.snapshots.get((instance_number, name))
+        if snapshot is None or snapshot.age > self.max_staleness:
+            snapshot = self.refresh(instance_number, name, collect, connect)
+        return snapshot
+
+    def peek(self, instance_number, name):
+        """Return the snapshot of ``name`` if one is fresh enough, without collecting."""
+        snapshot = self.snapshots.get((instance_number, name))
+        if snapshot is None or snapshot.age > self.max_staleness:
+            return None
+        return snapshot
+
+    def stop(self):
+        for refresher in self.refreshers.values():
+            refresher.stopped.set()
+
+
+def get_snapshot_cache(app, connect):
+    """Return the app's ``SnapshotCache``, or ``None`` when snapshots are disabled."""
+    interval = app.config.get("RQ_DASHBOARD_SNAPSHOT_INTERVAL")
+    if not interval or float(interval) <= 0:
+        return None
+    with _cache_lock:
+        cache = getattr(app, "rq_snapshots", None)
+        if cache is None:
+            max_staleness = app.config.get("RQ_DASHBOARD_SNAPSHOT_MAX_STALENESS")
+            if max_staleness is not None:
+                max_staleness = float(max_staleness) / 1000
+            cache = app.rq_snapshots = SnapshotCache(connect, float(interval) / 1000, max_staleness)
+    return cache
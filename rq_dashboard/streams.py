@@ -0,0 +1,136 @@
+"""Server-sent event streams shared by every viewer of the same data.
+
+All the open streams of one URL subscribe to a single ``Channel``: one
+background thread evaluates the payload every poll interval, with the shared
+snapshots when they are enabled, and wakes the subscribers up only when its
+ETag changed. Redis load then depends on the number of distinct streams, not
+on the number of viewers. The thread stops once the last subscriber is gone.
+
+A payload that fails, e.g. because the job of a job stream was deleted, closes
+the channel and ends its streams cleanly; browsers then reconnect and get the
+error as a regular response.
+
+"""
+import logging
+import threading
+
+from werkzeug.http import generate_etag
+
+logger = logging.getLogger(__name__)
+
+_hub_lock = threading.Lock()
+
+
+class TooManyStreams(Exception):
+    pass
+
+
+class Channel(threading.Thread):
+    """Evaluates one payload for all the subscribers of a stream."""
+
+    def __init__(self, hub, key, evaluate):
+        super().__init__(name="rq-dashboard-stream", daemon=True)
+        self.hub = hub
+        self.key = key
+        self.evaluate = evaluate
+        self.subscribers = 0
+        self.condition = threading.Condition()
+        self.version = 0
+        self.data = None
+        self.etag = None
+        self.error = None
+        self.closed = False
+
+    def run(self):
+        while True:
+            try:
+                data = self.evaluate()
+            except Exception as e:
+                logger.exception("Could not evaluate stream %s", self.key)
+                self.hub.discard(self)
+                with self.condition:
+                    self.error = e
+                    self.closed = True
+                    self.condition.notify_all()
+                return
+            etag = generate_etag(data.encode("utf-8"))
+            with self.condition:
+                if etag != self.etag:
+                    self.data, self.etag = data, etag
+                    self.version += 1
+                    self.condition.notify_all()
+            if not self.hub.keep(self):
+                return
+            with self.condition:
+                if self.condition.wait_for(lambda: self.closed, timeout=self.hub.interval):
+                    return
+
+    def wait(self, version, timeout):
+        """Wait until the data is newer than ``version``; return ``(version, data)``.
+
+        The data is ``None`` when it didn't change within ``timeout`` seconds.
+        Raises the payload's error once the channel is closed.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version or self.closed, timeout=timeout)
+            if self.closed:
+                raise self.error
+            if self.version == version:
+                return version, None
+            return self.version, self.data
+
+
+class StreamHub:
+    """The open channels of an app, keyed by stream URL."""
+
+    def __init__(self, interval, max_streams):
+        self.interval = interval
+        self.max_streams = max_streams
+        self.channels = {}
+        self.streams = 0
+        self.lock = threading.Lock()
+
+    def subscribe(self, key, evaluate):
+        """Return the channel of ``key``, starting it with ``evaluate`` if needed.
+
+        Raises ``TooManyStreams`` when ``max_streams`` streams are already open.
+        """
+        with self.lock:
+            if self.streams >= self.max_streams:
+                raise TooManyStreams()
+            channel = self.channels.get(key)
+            if channel is None:
+                channel = self.channels[key] = Channel(self, key, evaluate)
+                channel.start()
+            channel.subscribers += 1
+            self.streams += 1
+        return channel
+
+    def unsubscribe(self, channel):
+        with self.lock:
+            channel.subscribers -= 1
+            self.streams -= 1
+
+    def keep(self, channel):
+        """Tell whether ``channel`` still has subscribers, dropping it otherwise."""
+        with self.lock:
+            if channel.subscribers > 0:
+                return True
+            self.channels.pop(channel.key, None)
+        with channel.condition:
+            channel.closed = True
+        return False
+
+    def discard(self, channel):
+        with self.lock:
+            if self.channels.get(channel.key) is channel:
+                del self.channels[channel.key]
+
+
+def get_stream_hub(app, interval, max_streams):
+    """Return the app's ``StreamHub``."""
+    with _hub_lock:
+        hub = getattr(app, "rq_streams", None)
+        if hub is None:
+            hub = app.rq_streams = StreamHub(interval, max_streams)
+    return hub
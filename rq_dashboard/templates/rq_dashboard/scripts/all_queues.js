@@ -0,0 +1,65 @@
+(function($) {
+    var $raw_tpl = $('script[name=queue-row]').html();
+    var noQueuesHtml = $('script[name=no-queues-row]').html();
+    var template = _.template($raw_tpl);
+    var unreachableTemplate = _.template($('script[name=unreachable-instance]').html());
+    var $tbody = $('table#queues tbody');
+    var $unreachable = $('#unreachable-instances');
+    var $placeholderEl = $('tr[data-role=loading-placeholder]', $tbody);
+
+    var reload_table = function(done) {
+        $placeholderEl.show();
+
+        // Fetch the queues of every instance
+        api.getAllQueues(function(instances, queues, err) {
+            // Return immediately in case of error
+            if (err) {
+                return done();
+            }
+            onQueuesLoaded(instances, queues, done);
+        });
+    };
+
+    var onQueuesLoaded = function(instances, queues, done) {
+        var html = '';
+
+        $unreachable.empty();
+        $.each(instances, function(i, instance) {
+            if (!instance.reachable) {
+                $unreachable.append(unreachableTemplate({d: instance}, {variable: 'd'}));
+            }
+        });
+
+        $tbody.empty();
+
+        if (queues.length > 0) {
+            $.each(queues, function(i, queue) {
+                html += template({d: queue}, {variable: 'd'});
+            });
+            $tbody.append(html);
+        } else {
+            $tbody.append(noQueuesHtml);
+        }
+
+        if (done !== undefined) {
+            done();
+        }
+    };
+
+    var refresh_table_loop = function() {
+        $('span.loading').fadeIn('fast');
+        if (AUTOREFRESH_FLAG){
+            reload_table(function() {
+                $('span.loading').fadeOut('fast');
+                setTimeout(refresh_table_loop, POLL_INTERVAL);
+            });
+        } else {
+            setTimeout(refresh_table_loop, POLL_INTERVAL);
+        }
+    };
+
+    $(document).ready(function() {
+        refresh_table_loop();
+        $('#refresh-button').click(reload_table);
+    });
+})($);
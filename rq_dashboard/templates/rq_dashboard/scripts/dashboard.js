@@ -4,8 +4,12 @@ var url_for = function(name, param) {
     else if (name == 'queues_view') { url += {{ current_instance|tojson|safe }} + '/view/queues'; }
     else if (name == 'workers') { url += {{ current_instance|tojson|safe }} + '/data/workers.json'; }
     else if (name == 'workers_view') { url += {{ current_instance|tojson|safe }} + '/view/workers'; }
-    else if (name == 'delete_job') { url += 'job/' + encodeURIComponent(param) + '/delete'; }
-    else if (name == 'requeue_job') { url += 'job/' + encodeURIComponent(param) + '/requeue'; }
+    else if (name == 'all_queues') { url += 'all/data/queues.json'; }
+    else if (name == 'all_queues_view') { url += 'all/view/queues'; }
+    else if (name == 'queues_stream') { url += {{ current_instance|tojson|safe }} + '/stream/queues'; }
+    else if (name == 'workers_stream') { url += {{ current_instance|tojson|safe }} + '/stream/workers'; }
+    else if (name == 'delete_job') { url += {{ current_instance|tojson|safe }} + '/job/' + encodeURIComponent(param) + '/delete'; }
+    else if (name == 'requeue_job') { url += {{ current_instance|tojson|safe }} + '/job/' + encodeURIComponent(param) + '/requeue'; }
     return url;
 };
 
@@ -16,8 +20,27 @@ document.querySelectorAll('.ellipsify').forEach(function (elem) {
     }
 });
 
-var url_for_jobs_data = function(queue_name, registry_name, per_page, order, page) {
-    var url = {{ rq_url_prefix|tojson|safe }} + {{ current_instance|tojson|safe }} + '/data/jobs/' + encodeURIComponent(queue_name) + '/' + encodeURIComponent(registry_name) + '/' + encodeURIComponent(per_page) + '/'+ encodeURIComponent(order) + '/' + encodeURIComponent(page) + '.json';
+var cursor_query = function(cursor) {
+    return cursor ? '?cursor=' + encodeURIComponent(cursor) : '';
+};
+
+var url_for_jobs_data = function(queue_name, registry_name, per_page, order, page, cursor) {
+    var url = {{ rq_url_prefix|tojson|safe }} + {{ current_instance|tojson|safe }} + '/data/jobs/' + encodeURIComponent(queue_name) + '/' + encodeURIComponent(registry_name) + '/' + encodeURIComponent(per_page) + '/'+ encodeURIComponent(order) + '/' + encodeURIComponent(page) + '.json' + cursor_query(cursor);
+    return url;
+};
+
+var url_for_jobs_stream = function(queue_name, registry_name, per_page, order, page, cursor) {
+    var url = {{ rq_url_prefix|tojson|safe }} + {{ current_instance|tojson|safe }} + '/stream/jobs/' + encodeURIComponent(queue_name) + '/' + encodeURIComponent(registry_name) + '/' + encodeURIComponent(per_page) + '/'+ encodeURIComponent(order) + '/' + encodeURIComponent(page) + cursor_query(cursor);
+    return url;
+};
+
+var url_for_jobs_search = function(queue_name, registry_name, order, query) {
+    var url = {{ rq_url_prefix|tojson|safe }} + {{ current_instance|tojson|safe }} + '/data/search/' + encodeURIComponent(queue_name) + '/' + encodeURIComponent(registry_name) + '/' + encodeURIComponent(order) + '.json?' + $.param(query);
+    return url;
+};
+
+var url_for_queue_histories = function() {
+    var url = {{ rq_url_prefix|tojson|safe }} + {{ current_instance|tojson|safe }} + '/data/history.json';
     return url;
 };
 
@@ -31,6 +54,11 @@ var url_for_single_job_data = function(job_id) {
     return url;
 }
 
+var url_for_single_job_stream = function(job_id) {
+    var url = {{ rq_url_prefix|tojson|safe }} + {{ current_instance|tojson|safe }} + '/stream/job/' + encodeURIComponent(job_id);
+    return url;
+}
+
 var url_for_single_job_view = function(job_id) {
     var url = {{ rq_url_prefix|tojson|safe }} + {{ current_instance|tojson|safe }} + '/view/job/' + encodeURIComponent(job_id);
     return url;
@@ -55,6 +83,22 @@ var toShort = function(universal_date_string) {
     return d.format()
 }
 
+// Passed to api callbacks as error when the data didn't change since the
+// previous request for the same URL: there is nothing new to render.
+var NOT_MODIFIED = 'notmodified';
+
+// Like $.getJSON, but sends If-None-Match with the ETag of the previous
+// response for the same URL and calls not_modified on a 304.
+var getJSONIfModified = function(url, success, not_modified) {
+    return $.ajax({url: url, dataType: 'json', ifModified: true}).done(function(data, status) {
+        if (status === NOT_MODIFIED) {
+            not_modified();
+        } else {
+            success(data);
+        }
+    });
+};
+
 var api = {
     getRqInstances: function(cb) {
         $.getJSON(url_for('rq-instances'), function(data) {
@@ -66,43 +110,109 @@ var api = {
     },
 
     getQueues: function(cb) {
-        $.getJSON(url_for('queues'), function(data) {
+        getJSONIfModified(url_for('queues'), function(data) {
             var queues = data.queues;
             cb(queues);
+        }, function() {
+            cb(null, NOT_MODIFIED);
         }).fail(function(err){
             cb(null, err || true);
         });
     },
 
-    getJobs: function(queue_name, registry_name, per_page, order, page, cb) {
-        $.getJSON(url_for_jobs_data(queue_name, registry_name, per_page, order, page), function(data) {
+    getAllQueues: function(cb) {
+        getJSONIfModified(url_for('all_queues'), function(data) {
+            cb(data.instances, data.queues);
+        }, function() {
+            cb(null, null, NOT_MODIFIED);
+        }).fail(function(err){
+            cb(null, null, err || true);
+        });
+    },
+
+    getJobs: function(queue_name, registry_name, per_page, order, page, cursor, cb) {
+        getJSONIfModified(url_for_jobs_data(queue_name, registry_name, per_page, order, page, cursor), function(data) {
             var jobs = data.jobs;
             var pagination = data.pagination;
             cb(jobs, pagination);
+        }, function() {
+            cb(null, null, NOT_MODIFIED);
         }).fail(function(err){
             cb(null, null, err || true);
         });
     },
 
     getJob: function(job_id, cb) {
-        $.getJSON(url_for_single_job_data(job_id), function(data) {
+        getJSONIfModified(url_for_single_job_data(job_id), function(data) {
             var job = data;
             cb(job);
+        }, function() {
+            cb(null, NOT_MODIFIED);
         }).fail(function(err){
             cb(null, err || true);
         });
     },
 
     getWorkers: function(cb) {
-        $.getJSON(url_for('workers'), function(data) {
+        getJSONIfModified(url_for('workers'), function(data) {
             var workers = data.workers;
             cb(workers);
+        }, function() {
+            cb(null, NOT_MODIFIED);
         }).fail(function(err){
             cb(null, err || true);
         });
     }
 };
 
+//
+// Server-sent updates
+//
+// Calls on_data with every payload pushed on the stream at url. When streams
+// are disabled, unsupported or the stream can't be opened, fallback (the
+// page's polling loop) is started instead; so it is when the browser gives up
+// reconnecting, e.g. because the server answers a 503 once too many streams
+// are open. The stream is closed while autorefresh is switched off and
+// reopened, with the current state, after.
+var subscribe = function(url, on_data, fallback) {
+    if (!USE_STREAMS || typeof(EventSource) === 'undefined') {
+        return fallback();
+    }
+    var source = null;
+    var received = false;
+    var polling = false;
+
+    var open = function() {
+        source = new EventSource(url);
+        source.onmessage = function(e) {
+            received = true;
+            on_data(JSON.parse(e.data));
+        };
+        source.onerror = function() {
+            if (received && source.readyState !== EventSource.CLOSED) {
+                return;
+            }
+            source.close();
+            source = null;
+            polling = true;
+            fallback();
+        };
+    };
+
+    $('#autorefresh-switch').change(function() {
+        if (!received || polling) {
+            return;
+        }
+        if (AUTOREFRESH_FLAG) {
+            open();
+        } else if (source !== null) {
+            source.close();
+            source = null;
+        }
+    });
+    open();
+};
+
 //
 // Modal confirmation
 //
@@ -144,6 +254,10 @@ var modalConfirm = function(action, cb) {
     // Listen for changes on the select
     $rqInstances.change(function() {
         var new_instance_number = $('#rq-instances').find(':selected').data('instance-number');
+        if (new_instance_number === 'all') {
+            $(location).attr('href', url_for('all_queues_view'));
+            return;
+        }
         var url = url_for_new_instance(new_instance_number);
         $(location).attr('pathname', url);
     });
@@ -4,9 +4,15 @@
     var $job_data = $('#job-data');
     var job_id = {{ id|tojson|safe }};
     var html;
+    var lastJob;
+    // Dependencies loaded with "Show more", kept across refreshes
+    var moreDependencies = {depends_on: [], depends_on_status: [], depends_on_next_url: null};
 
     var reload_job_info = function(done) {
         api.getJob({{ id|tojson|safe }}, function(job, err) {
+            if (err === NOT_MODIFIED && done !== undefined) {
+                return done();
+            }
             if (err) {
                 return;
             }
@@ -14,6 +20,17 @@
         });
     };
 
+    var withMoreDependencies = function(job) {
+        if (!job.depends_on || moreDependencies.depends_on.length === 0) {
+            return job;
+        }
+        return $.extend({}, job, {
+            depends_on: job.depends_on.concat(moreDependencies.depends_on),
+            depends_on_status: job.depends_on_status.concat(moreDependencies.depends_on_status),
+            depends_on_next_url: moreDependencies.depends_on_next_url
+        });
+    };
+
     var onJobLoaded = function(job, done) {
         var html = '';
 
@@ -39,7 +56,8 @@
         if (job.status === "failed") {
             $("#requeue-job-btn").show()
         }
-        html += template({d: job}, {variable: 'd'});
+        lastJob = job;
+        html += template({d: withMoreDependencies(job)}, {variable: 'd'});
         $job_data[0].innerHTML = html;
 
         if (done !== undefined) {
@@ -58,10 +76,23 @@
     };
 
     $(document).ready(function() {
-        refresh_loop();
+        subscribe(url_for_single_job_stream(job_id), function(job) {
+            onJobLoaded(job);
+        }, refresh_loop);
         $('#refresh-button').click(reload_job_info);
     });
 
+    $job_data.on('click', '#more-dependencies-btn', function(e) {
+        e.preventDefault();
+        $.getJSON($(this).attr('href'), function(data) {
+            moreDependencies.depends_on = moreDependencies.depends_on.concat(data.depends_on);
+            moreDependencies.depends_on_status = moreDependencies.depends_on_status.concat(data.depends_on_status);
+            moreDependencies.depends_on_next_url = data.depends_on_next_url;
+            $job_data[0].innerHTML = template({d: withMoreDependencies(lastJob)}, {variable: 'd'});
+        });
+        return false;
+    });
+
     $("#delete-job-btn").click(function() {
         var url = url_for('delete_job', job_id);
 
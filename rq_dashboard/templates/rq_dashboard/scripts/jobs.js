@@ -22,7 +22,7 @@
         $placeholderEl.show();
 
         // Fetch the available jobs on the queue
-        api.getJobs({{ queue.name|tojson|safe }}, {{registry_name|tojson|safe}}, {{ per_page|tojson|safe}}, {{ order|tojson|safe }}, {{ page|tojson|safe }}, function(jobs, pagination, err) {
+        api.getJobs({{ queue.name|tojson|safe }}, {{registry_name|tojson|safe}}, {{ per_page|tojson|safe}}, {{ order|tojson|safe }}, {{ page|tojson|safe }}, {{ cursor|tojson|safe }}, function(jobs, pagination, err) {
             // Return immediately in case of error
             if (err) {
                 return done();
@@ -31,9 +31,20 @@
         });
     };
 
+    // Search results replace the page until the search is cleared
+    var searching = false;
+    var searchCursor = null;
+
     var onJobsLoaded = function(jobs, pagination, done) {
         var html = '';
 
+        if (searching) {
+            if (done !== undefined) {
+                done();
+            }
+            return;
+        }
+
         $tbody.empty();
 
         if (jobs.length > 0) {
@@ -117,10 +128,157 @@
     };
 
     $(document).ready(function() {
-        refresh_table_loop();
+        var stream_url = url_for_jobs_stream({{ queue.name|tojson|safe }}, {{registry_name|tojson|safe}}, {{ per_page|tojson|safe}}, {{ order|tojson|safe }}, {{ page|tojson|safe }}, {{ cursor|tojson|safe }});
+        subscribe(stream_url, function(data) {
+            onJobsLoaded(data.jobs, data.pagination);
+        }, refresh_table_loop);
         $('#refresh-button').click(reload_table);
     });
 
+    var renderJob = function(job) {
+        job.created_at = toRelative(Date.create(job.created_at));
+        if (job.ended_at !== undefined) {
+            job.ended_at = toRelative(Date.create(job.ended_at));
+        }
+        return template({d: job}, {variable: 'd'});
+    };
+
+    // Read the matches line by line as the server scans the jobs
+    var search = function(cursor) {
+        var query = {q: $('#search-text').val(), func: $('#search-func').val()};
+        if (cursor) {
+            query.cursor = cursor;
+        }
+        var url = url_for_jobs_search({{ queue.name|tojson|safe }}, {{ registry_name|tojson|safe }}, {{ order|tojson|safe }}, query);
+        var decoder = new TextDecoder();
+        var buffer = '';
+        var found = cursor ? $('tr[data-role=job]', $tbody).length : 0;
+
+        searching = true;
+        if (!cursor) {
+            $tbody.empty();
+            $ul.empty();
+        }
+        $('#search-more-btn').hide();
+        $('#search-clear-btn').show();
+        $('#search-status').text('Searching...');
+
+        var onLine = function(line) {
+            var data = JSON.parse(line);
+            if (data.job !== undefined) {
+                $tbody.append(renderJob(data.job));
+                found += 1;
+                return;
+            }
+            searchCursor = data.cursor;
+            $('#search-status').text(found + ' matching jobs, ' + data.scanned + ' scanned' + (data.cursor ? ', more jobs left to scan' : ''));
+            $('#search-more-btn').toggle(data.cursor !== null);
+            if (found === 0) {
+                $tbody.append(noJobsHtml);
+            }
+        };
+
+        fetch(url, {credentials: 'same-origin'}).then(function(response) {
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            var reader = response.body.getReader();
+            var read = function() {
+                return reader.read().then(function(chunk) {
+                    if (chunk.done) {
+                        return;
+                    }
+                    buffer += decoder.decode(chunk.value, {stream: true});
+                    var lines = buffer.split('\n');
+                    buffer = lines.pop();
+                    $.each(lines, function(i, line) {
+                        if (line) {
+                            onLine(line);
+                        }
+                    });
+                    return read();
+                });
+            };
+            return read();
+        }).catch(function(err) {
+            $('#search-status').text('Search failed: ' + err.message);
+        });
+    };
+
+    $('#search-form').submit(function(e) {
+        e.preventDefault();
+        search(null);
+    });
+
+    $('#search-more-btn').click(function() {
+        $('tr:not([data-role=job])', $tbody).remove();
+        search(searchCursor);
+    });
+
+    $('#search-clear-btn').click(function() {
+        searching = false;
+        searchCursor = null;
+        $('#search-text, #search-func').val('');
+        $('#search-status').text('');
+        $('#search-more-btn, #search-clear-btn').hide();
+        reload_table();
+    });
+
+    // Show the progress of a background operation until it ends, then reload
+    var $progress = $('#operation-progress');
+    var $progressBar = $('.progress-bar', $progress);
+    var $progressStatus = $('[data-role=operation-status]', $progress);
+
+    var showOperation = function(operation) {
+        var percent = operation.total ? Math.min(100, 100 * operation.processed / operation.total) : 100;
+        var status = operation.name + ': ' + operation.processed + ' / ' + operation.total + ' jobs';
+        var outcomes = $.map(operation.outcomes || {}, function(count, outcome) {
+            return count + ' ' + outcome;
+        });
+        if (outcomes.length > 0) {
+            status += ' (' + outcomes.join(', ') + ')';
+        }
+        if (operation.rate) {
+            status += ', ' + operation.rate.toFixed(1) + ' jobs/s';
+        }
+        if (operation.status === 'running' && operation.eta !== null) {
+            status += ', about ' + Math.ceil(operation.eta) + 's left';
+        }
+        if (operation.status === 'failed') {
+            status += ' (failed: ' + operation.error + ')';
+            $progressBar.addClass('bg-danger');
+        }
+        $progressBar.css('width', percent + '%');
+        $progressStatus.text(status);
+    };
+
+    var trackOperation = function(data) {
+        if (data.status !== 'OK' || data.operation_url === undefined) {
+            reload_table();
+            return;
+        }
+        $progressBar.removeClass('bg-danger');
+        $progress.show();
+        showOperation(data.operation);
+
+        var poll = function() {
+            $.getJSON(data.operation_url, function(operation) {
+                showOperation(operation);
+                if (operation.status === 'finished' || operation.status === 'failed') {
+                    reload_table();
+                    if (operation.status === 'finished') {
+                        setTimeout(function() { $progress.fadeOut('slow'); }, POLL_INTERVAL);
+                    }
+                } else {
+                    setTimeout(poll, 1000);
+                }
+            }).fail(function() {
+                $progress.hide();
+            });
+        };
+        poll();
+    };
+
     // Enable the AJAX behaviour of the empty button
     $('#empty-btn').click(function(e) {
         e.preventDefault();
@@ -128,9 +286,7 @@
 
         var $this = $(this);
         modalConfirm('empty', function() {
-            $.post($this.attr('href'), function(data) {
-                reload_table();
-            });
+            $.post($this.attr('href'), trackOperation);
         });
 
         return false;
@@ -142,7 +298,7 @@
 
         var $this = $(this);
         modalConfirm('compact', function() {
-           $.post($this.attr('href'), function(data) {});
+            $.post($this.attr('href'), trackOperation);
         });
         return false;
     });
@@ -153,7 +309,7 @@
 
         var $this = $(this);
         modalConfirm('requeue all', function() {
-            $.post($this.attr('href'), function(data) {});
+             $.post($this.attr('href'), trackOperation);
         });
         return false;
     });
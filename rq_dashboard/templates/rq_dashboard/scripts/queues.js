@@ -14,23 +14,68 @@
             if (err) {
                 return done();
             }
-            var html = '';
-
-            $tbody.empty();
-
-            if (queues.length > 0) {
-                $.each(queues, function(i, queue) {
-                    var el = template({d: queue}, {variable: 'd'});
-                    html += el;
-                });
-                $tbody.append(html);
-            } else {
-                $tbody.append(noQueuesHtml);
-            }
+            onQueuesLoaded(queues, done);
+        });
+    };
 
-            if (done !== undefined) {
-                done();
-            }
+    var onQueuesLoaded = function(queues, done) {
+        var html = '';
+
+        $tbody.empty();
+
+        if (queues.length > 0) {
+            $.each(queues, function(i, queue) {
+                var el = template({d: queue}, {variable: 'd'});
+                html += el;
+            });
+            $tbody.append(html);
+            loadSparklines();
+        } else {
+            $tbody.append(noQueuesHtml);
+        }
+
+        if (done !== undefined) {
+            done();
+        }
+    };
+
+    // Sparklines of the queued jobs, fetched again once per sampling interval
+    var HISTORY_INTERVAL = {{ history_interval|tojson|safe }};
+    var sparklines = {};
+    var sparklinesLoadedAt = 0;
+
+    var sparkline = function(values) {
+        if (values.length < 2) {
+            return '';
+        }
+        var width = 120, height = 24;
+        var max = Math.max.apply(null, values) || 1;
+        var points = $.map(values, function(value, i) {
+            var x = i * width / (values.length - 1);
+            var y = height - 1 - value * (height - 2) / max;
+            return x.toFixed(1) + ',' + y.toFixed(1);
+        });
+        return '<svg width="' + width + '" height="' + height + '"><title>' + values[values.length - 1] + ' queued, at most ' + max + '</title>' +
+            '<polyline fill="none" stroke="currentColor" stroke-width="1.5" points="' + points.join(' ') + '"/></svg>';
+    };
+
+    var showSparklines = function() {
+        $('tr[data-role=queue]', $tbody).each(function() {
+            $('[data-role=sparkline]', this).html(sparklines[$(this).attr('data-queue-name')] || '');
+        });
+    };
+
+    var loadSparklines = function() {
+        showSparklines();
+        if (!HISTORY_INTERVAL || Date.now() - sparklinesLoadedAt < HISTORY_INTERVAL * 1000) {
+            return;
+        }
+        sparklinesLoadedAt = Date.now();
+        $.getJSON(url_for_queue_histories(), function(data) {
+            $.each(data.queues, function(i, history) {
+                sparklines[history.name] = sparkline(history.count);
+            });
+            showSparklines();
         });
     };
 
@@ -47,7 +92,9 @@
     };
 
     $(document).ready(function() {
-        refresh_table_loop();
+        subscribe(url_for('queues_stream'), function(data) {
+            onQueuesLoaded(data.queues);
+        }, refresh_table_loop);
         $('#refresh-button').click(reload_table);
         $('[data-toggle=tooltip]').tooltip();
     });
@@ -18,31 +18,35 @@
                 return;
             }
 
-            var html = '';
+            onWorkersLoaded(workers, done);
+        });
+    };
 
-            $tbody.empty();
+    var onWorkersLoaded = function(workers, done) {
+        var html = '';
 
-            if (workers.length > 0) {
-                $('#workers-count').html(workers.length + ' workers registered')
+        $tbody.empty();
 
-                $.each(workers, function(i, worker) {
-                    if (worker.state === 'busy') {
-                        worker.state = 'play';
-                    } else {
-                        worker.state = 'pause';
-                    }
-                    html += template({d: worker}, {variable: 'd'});
-                });
-                $tbody.append(html);
-            } else {
-                $('#workers-count').html('No workers registered!')
-                $tbody.append(noWorkersHtml);
-            }
+        if (workers.length > 0) {
+            $('#workers-count').html(workers.length + ' workers registered')
 
-            if (done !== undefined) {
-                done(workers.length);
-            }
-        });
+            $.each(workers, function(i, worker) {
+                if (worker.state === 'busy') {
+                    worker.state = 'play';
+                } else {
+                    worker.state = 'pause';
+                }
+                html += template({d: worker}, {variable: 'd'});
+            });
+            $tbody.append(html);
+        } else {
+            $('#workers-count').html('No workers registered!')
+            $tbody.append(noWorkersHtml);
+        }
+
+        if (done !== undefined) {
+            done(workers.length);
+        }
     };
 
     var refresh_table_loop = function() {
@@ -58,10 +62,10 @@
     };
 
     $(document).ready(function() {
-        reload_table(function(workers_count) {
-            $('#refresh-button').click(reload_table);
-            refresh_table_loop();
-        });
+        $('#refresh-button').click(reload_table);
+        subscribe(url_for('workers_stream'), function(data) {
+            onWorkersLoaded(data.workers);
+        }, refresh_table_loop);
     });
 })($);
 
@@ -16,23 +16,33 @@ As a quick-and-dirty convenience, the command line invocation in ``cli.py``
 provides the option to require HTTP Basic Auth in a few lines of code.
 
 """
+import io
 import json
 import os
 import re
-from functools import wraps
+import threading
+import time
+import zlib
+from base64 import b64decode
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial, wraps
 from math import ceil
 
 import arrow
+import redis
 from flask import (
     Blueprint,
+    Response,
+    abort,
     current_app,
+    g,
     make_response,
     render_template,
     request,
     send_from_directory,
+    stream_with_context,
     url_for,
 )
-from redis.exceptions import ConnectionError as RedisConnectionError
 from redis_sentinel_url import connect as from_url
 from rq import (
     VERSION as rq_version,
@@ -40,10 +50,10 @@ from rq import (
     Worker,
     requeue_job,
 )
+from rq.defaults import DEFAULT_FAILURE_TTL, DEFAULT_RESULT_TTL
 from rq.exceptions import NoSuchJobError
 from rq.job import Job
 from rq.registry import (
-    BaseRegistry,
     CanceledJobRegistry,
     DeferredJobRegistry,
     FailedJobRegistry,
@@ -51,12 +61,23 @@ from rq.registry import (
     ScheduledJobRegistry,
     StartedJobRegistry,
 )
+from rq.results import Result
+from rq.utils import as_text, now, utcformat, utcparse
 from six import string_types
 
+from .cursors import AFTER, BEFORE, decode_cursor, encode_cursor, queue_page, registry_page
+from .history import get_queue_history
 from .legacy_config import upgrade_config
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, get_metrics_cache, render_metrics
+from .operations import Operation, start_operation
+from .perf import end_request, get_recorder, instrument, perf_enabled, start_request, timed
+from .previews import get_preview_cache
+from .profiling import Profile, RequestProfiler, profiling_token, token_matches
+from .snapshots import get_snapshot_cache
+from .streams import TooManyStreams, get_stream_hub
 from .version import VERSION as rq_dashboard_version
 
-from rq.serializers import DefaultSerializer
+from rq.serializers import DefaultSerializer, resolve_serializer
 
 
 blueprint = Blueprint(
@@ -68,6 +89,126 @@ class Config:
 
 config: Config = Config()
 
+REGISTRY_CLASSES = {
+    "failed": FailedJobRegistry,
+    "deferred": DeferredJobRegistry,
+    "started": StartedJobRegistry,
+    "finished": FinishedJobRegistry,
+    "scheduled": ScheduledJobRegistry,
+    "canceled": CanceledJobRegistry,
+}
+
+_redis_connections_lock = threading.Lock()
+_instances_executor_lock = threading.Lock()
+
+
+# Size of each instance's connection pool, and seconds a request waits for one
+# of its connections to be free before failing.
+DEFAULT_MAX_CONNECTIONS = 50
+DEFAULT_POOL_TIMEOUT = 5
+
+
+def _redis_client_options(app, default_timeout=None):
+    """Return the keyword arguments used to build every Redis client.
+
+    ``default_timeout`` is the socket and connect timeout used when the
+    settings leave them unset.
+    """
+    options = dict(password=app.config.get("RQ_DASHBOARD_REDIS_PASSWORD"))
+    for option, setting, cast in (
+        ("socket_timeout", "RQ_DASHBOARD_REDIS_SOCKET_TIMEOUT", float),
+        ("socket_connect_timeout", "RQ_DASHBOARD_REDIS_SOCKET_CONNECT_TIMEOUT", float),
+    ):
+        value = app.config.get(setting)
+        if value is not None:
+            options[option] = cast(value)
+        elif default_timeout is not None:
+            options[option] = default_timeout
+    return options
+
+
+def _redis_pool_options(app):
+    """Return the keyword arguments of the instances' ``BlockingConnectionPool``.
+
+    When all connections are in use, requests wait up to the pool timeout for
+    one to be given back instead of failing with "Too many connections".
+    A pool timeout set to ``None`` waits forever.
+    """
+    timeout = app.config.get("RQ_DASHBOARD_REDIS_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)
+    return dict(
+        max_connections=int(app.config.get("RQ_DASHBOARD_REDIS_MAX_CONNECTIONS") or DEFAULT_MAX_CONNECTIONS),
+        timeout=float(timeout) if timeout is not None else None,
+    )
+
+
+def connect(app, redis_url, default_timeout=None):
+    """Return a new Redis client for ``redis_url``.
+
+    Sentinel URLs get redis-py's sentinel pool, which can't block and so is
+    left unbounded.
+    """
+    client_options = _redis_client_options(app, default_timeout)
+    if redis_url.startswith("redis+sentinel://"):
+        _, client = from_url(
+            redis_url,
+            sentinel_options={'password': app.config.get('RQ_DASHBOARD_REDIS_SENTINEL_PASSWORD')},
+            client_options=client_options,
+        )
+        return client
+    pool = redis.BlockingConnectionPool.from_url(redis_url, **client_options, **_redis_pool_options(app))
+    return redis.Redis(connection_pool=pool)
+
+
+def get_redis_urls(app):
+    """Return the configured Redis URLs, one per dashboard instance."""
+    redis_url = app.config.get("RQ_DASHBOARD_REDIS_URL")
+    if isinstance(redis_url, string_types):
+        redis_url = (redis_url,)
+    return redis_url
+
+
+def get_redis_connection(app, instance_number):
+    """Return the long-lived Redis client of the given instance.
+
+    Clients are created lazily on first use and kept in ``app.redis_connections``,
+    so every request to an instance shares the same bounded connection pool
+    instead of reconnecting (and re-running sentinel discovery) each time.
+    """
+    return _get_client(app, "redis_connections", instance_number)
+
+
+def get_fan_out_connection(app, instance_number):
+    """Return the Redis client of an instance used when querying all instances at once.
+
+    Unless the socket timeouts are configured, its calls time out after
+    ``RQ_DASHBOARD_INSTANCE_TIMEOUT`` seconds, so a hung instance gives the
+    threads of the all-instances pool back instead of holding them forever.
+    """
+    timeout = float(app.config.get("RQ_DASHBOARD_INSTANCE_TIMEOUT", 2))
+    return _get_client(app, "rq_fan_out_connections", instance_number, timeout)
+
+
+def _get_client(app, attribute, instance_number, default_timeout=None):
+    """Return the client of an instance kept in the ``attribute`` dict of the app."""
+    redis_url = get_redis_urls(app)
+    if not redis_url:
+        raise RuntimeError("No Redis configuration!")
+    if not 0 <= instance_number < len(redis_url):
+        raise LookupError("Index exceeds RQ list. Not Permitted.")
+
+    connections = getattr(app, attribute, None)
+    if connections is None or instance_number not in connections:
+        with _redis_connections_lock:
+            if getattr(app, attribute, None) is None:
+                setattr(app, attribute, {})
+            connections = getattr(app, attribute)
+            if instance_number not in connections:
+                connections[instance_number] = connect(app, redis_url[instance_number], default_timeout)
+                if perf_enabled(app):
+                    instrument(connections[instance_number])
+    return connections[instance_number]
+
+
 # @blueprint.before_app_first_request
 def setup_rq_connection(current_app):
     # we need to do It here instead of cli, since It may be embeded
@@ -76,38 +217,130 @@ def setup_rq_connection(current_app):
     redis_url = current_app.config.get("RQ_DASHBOARD_REDIS_URL")
     if isinstance(redis_url, string_types):
         current_app.config["RQ_DASHBOARD_REDIS_URL"] = (redis_url,)
-        _, current_app.redis_conn = from_url((redis_url,)[0], sentinel_options={'password': current_app.config.get('RQ_DASHBOARD_REDIS_SENTINEL_PASSWORD')}, client_options={'password': current_app.config.get('RQ_DASHBOARD_REDIS_PASSWORD')})
-    elif isinstance(redis_url, (tuple, list)):
-        _, current_app.redis_conn = from_url(redis_url[0], sentinel_options={'password': current_app.config.get('RQ_DASHBOARD_REDIS_SENTINEL_PASSWORD')}, client_options={'password': current_app.config.get('RQ_DASHBOARD_REDIS_PASSWORD')})
-    else:
+    elif not isinstance(redis_url, (tuple, list)):
         raise RuntimeError("No Redis configuration!")
+    current_app.redis_connections = {}
+    current_app.redis_conn = get_redis_connection(current_app, 0)
+    # Start sampling the queue history, when enabled, with the app rather than
+    # on its first request.
+    get_history(current_app)
+
+
+def get_serializer(app, instance_number):
+    """Return the serializer used for the jobs of the given instance.
+
+    ``RQ_DASHBOARD_SERIALIZERS`` may list one serializer (or its dotted import
+    path) per entry of ``RQ_DASHBOARD_REDIS_URL``; instances without an entry
+    use the dashboard-wide ``config.serializer``.
+    """
+    serializers = app.config.get("RQ_DASHBOARD_SERIALIZERS") or ()
+    if isinstance(serializers, string_types):
+        serializers = serializers.split(",")
+    if instance_number < len(serializers) and serializers[instance_number]:
+        return resolve_serializer(serializers[instance_number])
+    return config.serializer
+
+
+@blueprint.before_request
+def start_request_timing():
+    if perf_enabled(current_app):
+        start_request()
+
+
+@blueprint.after_request
+def add_server_timing(response):
+    """Send the timings of the request along and add them to the per-route stats."""
+    timings = end_request()
+    if timings is not None:
+        total = timings.elapsed()
+        response.headers["Server-Timing"] = timings.server_timing(total)
+        if request.endpoint not in (None, "rq_dashboard.perf_stats"):
+            get_recorder(current_app._get_current_object()).record(
+                g.get("instance_number", 0), request.endpoint, timings, total
+            )
+    return response
 
 
 @blueprint.before_request
 def push_rq_connection():
-    new_instance_number = request.view_args.get("instance_number")
-    if new_instance_number is not None:
-        redis_url = current_app.config.get("RQ_DASHBOARD_REDIS_URL")
-        if new_instance_number < len(redis_url):
-            _, new_instance = from_url(redis_url[new_instance_number], sentinel_options={'password': current_app.config.get('RQ_DASHBOARD_REDIS_SENTINEL_PASSWORD')}, client_options={'password': current_app.config.get('RQ_DASHBOARD_REDIS_PASSWORD')})
-        else:
-            raise LookupError("Index exceeds RQ list. Not Permitted.")
-    else:
-        new_instance = current_app.redis_conn
-    
-    current_app.redis_conn = new_instance
+    """Bind the Redis client and serializer of the requested instance to ``g``.
+
+    The state is request-scoped so that concurrent requests for different
+    instances never see each other's connection. Routes without an instance
+    number use the first instance.
+    """
+    instance_number = (request.view_args or {}).get("instance_number")
+    if instance_number is None:
+        instance_number = 0
+    g.instance_number = instance_number
+    g.redis_conn = get_redis_connection(current_app, instance_number)
+    g.serializer = get_serializer(current_app, instance_number)
+
+
+PROFILE_ENDPOINTS = ("rq_dashboard.list_profiles", "rq_dashboard.profile_download")
 
 
+@blueprint.before_request
+def start_profiling():
+    """Profile the request if it carries the profiling token, see ``profiling``."""
+    token = request.headers.get("X-Profile-Token") or request.args.get("profile")
+    if token is None or request.endpoint in PROFILE_ENDPOINTS or not token_matches(current_app, token):
+        return
+    g.request_profiler = RequestProfiler.start()
+    # Another request holds the profiler; say so rather than hold this one up.
+    g.profiler_busy = g.request_profiler is None
+
+
+@blueprint.after_request
+def save_profile(response):
+    request_profiler = g.pop("request_profiler", None)
+    if request_profiler is None:
+        if g.pop("profiler_busy", False):
+            response.headers["X-Profile-Id"] = "busy"
+        return response
+    stats, duration = request_profiler.stop()
+    profile = Profile(request.endpoint, request.full_path, duration, stats)
+    profile.save(
+        g.redis_conn,
+        ttl=int(current_app.config.get("RQ_DASHBOARD_PROFILING_TTL", 3600)),
+        keep=int(current_app.config.get("RQ_DASHBOARD_PROFILING_KEEP", 20)),
+    )
+    response.headers["X-Profile-Id"] = profile.id
+    response.headers["X-Profile-Url"] = url_for(
+        ".profile_download", instance_number=g.instance_number, profile_id=profile.id, format="pstats"
+    )
+    return response
+
+
+@blueprint.teardown_request
+def stop_profiling(exc):
+    """Release the profiling slot of requests that failed before ``save_profile``."""
+    request_profiler = g.pop("request_profiler", None)
+    if request_profiler is not None:
+        request_profiler.stop()
 
 
+def json_response(result):
+    """Turn a view result, optionally a ``(dict, headers)`` pair, into a response."""
+    from flask import jsonify as flask_jsonify
+
+    headers = {"Cache-Control": "no-store"}
+    if isinstance(result, tuple):
+        result, extra_headers = result
+        headers.update(extra_headers)
+    with timed("serialize"):
+        response = flask_jsonify(**result)
+    response.headers.update(headers)
+    # Pollers send back the ETag of the payload they already show and get
+    # an empty 304 while nothing changed.
+    response.add_etag()
+    return response.make_conditional(request)
+
 
 def jsonify(f):
     @wraps(f)
     def _wrapped(*args, **kwargs):
-        from flask import jsonify as flask_jsonify
-
-        result_dict = f(*args, **kwargs)
-        return flask_jsonify(**result_dict), {"Cache-Control": "no-store"}
+        return json_response(f(*args, **kwargs))
 
     return _wrapped
 
@@ -119,11 +352,244 @@ def check_delete_enable(f):
         return f(*args, **kwargs)
     return wrapper
 
-def serialize_queues(instance_number, queues):
+def collect_from_instance(app, instance_number, name, collect, fan_out=False):
+    """Return ``collect(connection)`` for an instance and the age of the data.
+
+    With snapshots enabled the value comes from the shared snapshot of the
+    instance and the age is in seconds; otherwise it is collected now and the
+    age is ``None``. Data collected now uses the ``get_fan_out_connection``
+    client when ``fan_out``. Doesn't need a request context.
+    """
+    get_connection = get_fan_out_connection if fan_out else get_redis_connection
+    snapshots = get_snapshot_cache(app, partial(get_redis_connection, app))
+    if snapshots is None:
+        return collect(get_connection(app, instance_number)), None
+    snapshot = snapshots.get(instance_number, name, collect, partial(get_connection, app))
+    return snapshot.value, snapshot.age
+
+
+def snapshot_or_collect(instance_number, name, collect):
+    """Return ``collect(connection)`` and the headers to send along with it.
+
+    With snapshots enabled ``X-Snapshot-Age`` tells how old the value is, in
+    seconds.
+    """
+    value, age = collect_from_instance(current_app._get_current_object(), instance_number, name, collect)
+    return value, snapshot_headers(age)
+
+
+def snapshot_headers(age):
+    """Return the ``X-Snapshot-Age`` header of data of the given age, if it is a snapshot."""
+    if age is None:
+        return {}
+    return {"X-Snapshot-Age": "{:.3f}".format(age)}
+
+
+def get_instances_executor(app):
+    """Return the thread pool used to query all instances at once."""
+    with _instances_executor_lock:
+        executor = getattr(app, "rq_instances_executor", None)
+        if executor is None:
+            workers = 2 * len(get_redis_urls(app))
+            executor = app.rq_instances_executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="rq-dashboard-instances"
+            )
+    return executor
+
+
+def submit_instance_collection(app, instance_number, name, collect):
+    """Collect ``name`` from an instance in the all-instances pool; return the future.
+
+    A collection still running for the same instance and name is joined
+    rather than duplicated, so an instance that doesn't answer holds at most
+    one thread of the pool per name, until its socket times out.
+    """
+    executor = get_instances_executor(app)
+    with _instances_executor_lock:
+        futures = getattr(app, "rq_instance_futures", None)
+        if futures is None:
+            futures = app.rq_instance_futures = {}
+        future = futures.get((instance_number, name))
+        if future is None or future.done():
+            future = futures[(instance_number, name)] = executor.submit(
+                collect_from_instance, app, instance_number, name, collect, fan_out=True
+            )
+    return future
+
+
+def collect_from_all_instances(name, collector):
+    """Run the ``collector(app, instance_number)`` of every configured instance concurrently.
+
+    Yields ``(instance_number, value, error)`` for each instance, in order.
+    Instances that fail, or don't answer within ``RQ_DASHBOARD_INSTANCE_TIMEOUT``
+    seconds, have a ``None`` value and the reason as error, so the slowest
+    instance bounds the latency rather than the sum of all of them.
+    """
+    app = current_app._get_current_object()
+    timeout = float(app.config.get("RQ_DASHBOARD_INSTANCE_TIMEOUT", 2))
+    futures = [
+        submit_instance_collection(app, instance_number, name, collector(app, instance_number))
+        for instance_number in range(len(get_redis_urls(app)))
+    ]
+    done, _ = wait(futures, timeout=timeout)
+    for instance_number, future in enumerate(futures):
+        if future not in done:
+            yield instance_number, None, "No answer within {:g}s".format(timeout)
+        elif future.exception() is not None:
+            yield instance_number, None, str(future.exception()) or type(future.exception()).__name__
+        else:
+            yield instance_number, future.result()[0], None
+
+
+# Windows, in seconds, of the finished and failed job rates.
+RATE_WINDOWS = {"1m": 60, "5m": 300}
+
+
+def pipeline_queue_stats(pipe, queue_names, timestamp=None, result_ttl=DEFAULT_RESULT_TTL,
+                         failure_ttl=DEFAULT_FAILURE_TTL):
+    """Queue the calls counting the jobs of ``queue_names`` and their recent rates.
+
+    Registries score jobs by expiry, i.e. the time a job ended plus its result
+    or failure TTL, so the jobs that finished or failed in the last ``window``
+    seconds are counted with ``ZCOUNT`` over that range of scores, assuming
+    they were kept for ``result_ttl`` and ``failure_ttl`` seconds. The id of
+    the job at the head of each queue is read along, for
+    ``pipeline_queue_heads``. Every call touches a single key, so the pipeline
+    also works against Redis Cluster.
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    for queue_name in queue_names:
+        queue_key = Queue.redis_queue_namespace_prefix + queue_name
+        pipe.llen(queue_key)
+        for registry_class in REGISTRY_CLASSES.values():
+            pipe.zcard(registry_class.key_template.format(queue_name))
+        for registry_class, ttl in (
+            (FinishedJobRegistry, result_ttl),
+            (FailedJobRegistry, failure_ttl),
+        ):
+            key = registry_class.key_template.format(queue_name)
+            for window in RATE_WINDOWS.values():
+                pipe.zcount(key, "({}".format(timestamp + ttl - window), timestamp + ttl)
+        pipe.lindex(queue_key, 0)
+
+
+def parse_queue_stats(queue_names, responses):
+    """Map each queue name to its counts from the replies of ``pipeline_queue_stats``.
+
+    Besides ``count`` and the ``<registry>_job_registry_count`` entries, the
+    counts hold the ``finished_rate_<window>`` and ``failed_rate_<window>``
+    jobs per second and ``oldest_queued_at``, when the head job was enqueued,
+    which stays ``None`` until ``parse_queue_heads`` fills it in. Returns the
+    stats along with the ``(queue_name, job_id)`` heads of the non-empty
+    queues.
+    """
+    results = iter(responses)
+    stats = {}
+    heads = []
+    for queue_name in queue_names:
+        counts = dict(count=next(results))
+        for registry_name in REGISTRY_CLASSES:
+            counts["{}_job_registry_count".format(registry_name)] = next(results)
+        for outcome in ("finished", "failed"):
+            for window_name, window in RATE_WINDOWS.items():
+                counts["{}_rate_{}".format(outcome, window_name)] = next(results) / window
+        counts["oldest_queued_at"] = None
+        head = next(results)
+        if head is not None:
+            heads.append((queue_name, as_text(head)))
+        stats[queue_name] = counts
+    return stats, heads
+
+
+def pipeline_queue_heads(pipe, heads):
+    """Queue the calls reading when the head jobs returned by ``parse_queue_stats`` were enqueued."""
+    for _, job_id in heads:
+        pipe.hget(Job.redis_job_namespace_prefix + job_id, "enqueued_at")
+
+
+def parse_queue_heads(stats, heads, responses):
+    """Set the ``oldest_queued_at`` of ``stats`` from the replies of ``pipeline_queue_heads``."""
+    for (queue_name, _), enqueued_at in zip(heads, responses):
+        stats[queue_name]["oldest_queued_at"] = utcparse(as_text(enqueued_at)) if enqueued_at else None
+
+
+def collect_queue_stats(queues, result_ttl=DEFAULT_RESULT_TTL, failure_ttl=DEFAULT_FAILURE_TTL):
+    """Return the job counts of every queue and its registries.
+
+    All ``LLEN``/``ZCARD``/``ZCOUNT`` calls are sent in a single pipeline, and
+    the enqueue times of the jobs at the head of the queues in a second one,
+    so the cost is at most two round trips whatever the number of queues. The
+    result maps each queue name to the counts described by
+    ``parse_queue_stats``.
+    """
+    if not queues:
+        return {}
+    queue_names = [q.name for q in queues]
+    pipe = queues[0].connection.pipeline(transaction=False)
+    pipeline_queue_stats(pipe, queue_names, result_ttl=result_ttl, failure_ttl=failure_ttl)
+    stats, heads = parse_queue_stats(queue_names, pipe.execute())
+    if heads:
+        pipeline_queue_heads(pipe, heads)
+        parse_queue_heads(stats, heads, pipe.execute())
+    return stats
+
+
+def collect_queues(connection, result_ttl=DEFAULT_RESULT_TTL, failure_ttl=DEFAULT_FAILURE_TTL):
+    """Return the sorted queues of an instance along with their job counts."""
+    queues = sorted(Queue.all(connection=connection))
+    return queues, collect_queue_stats(queues, result_ttl=result_ttl, failure_ttl=failure_ttl)
+
+
+def get_rate_ttls(app):
+    """Return the result and failure TTLs the queue rates assume, as keyword arguments.
+
+    They default to RQ's and are set with ``RQ_DASHBOARD_RESULT_TTL`` and
+    ``RQ_DASHBOARD_FAILURE_TTL`` when the workers use other ones.
+    """
+    return dict(
+        result_ttl=int(app.config.get("RQ_DASHBOARD_RESULT_TTL", DEFAULT_RESULT_TTL)),
+        failure_ttl=int(app.config.get("RQ_DASHBOARD_FAILURE_TTL", DEFAULT_FAILURE_TTL)),
+    )
+
+
+def queues_collector(app, instance_number):
+    """Return ``collect_queues`` bound to the TTLs of ``get_rate_ttls``."""
+    return partial(collect_queues, **get_rate_ttls(app))
+
+
+QUEUE_STATS_FIELDS = ("count",) + tuple("{}_job_registry_count".format(name) for name in REGISTRY_CLASSES)
+
+
+def sample_queue_stats(app, instance_number):
+    """Return the job counts of every queue of an instance, from the snapshot if any."""
+    (_, stats), _ = collect_from_instance(app, instance_number, "queues", queues_collector(app, instance_number))
+    return stats
+
+
+def get_history(app):
+    """Return the app's queue history, starting its samplers, or ``None`` when disabled."""
+    return get_queue_history(
+        app,
+        partial(get_redis_connection, app),
+        partial(sample_queue_stats, app),
+        QUEUE_STATS_FIELDS,
+        range(len(get_redis_urls(app))),
+    )
+
+
+def serialize_queues(instance_number, queues, stats=None):
+    if stats is None:
+        stats = collect_queue_stats(queues)
     return [
         dict(
             name=q.name,
-            count=q.count,
+            count=stats[q.name]["count"],
+            oldest_queued_at=serialize_date(stats[q.name]["oldest_queued_at"]),
+            finished_rate_1m=stats[q.name]["finished_rate_1m"],
+            finished_rate_5m=stats[q.name]["finished_rate_5m"],
+            failed_rate_1m=stats[q.name]["failed_rate_1m"],
+            failed_rate_5m=stats[q.name]["failed_rate_5m"],
             queued_url=url_for(
                 ".jobs_overview",
                 instance_number=instance_number,
@@ -133,7 +599,7 @@ def serialize_queues(instance_number, queues):
                 order="asc",
                 page="1",
             ),
-            failed_job_registry_count=FailedJobRegistry(q.name, connection=q.connection).get_job_count(cleanup=False),
+            failed_job_registry_count=stats[q.name]["failed_job_registry_count"],
             failed_url=url_for(
                 ".jobs_overview",
                 instance_number=instance_number,
@@ -143,7 +609,7 @@ def serialize_queues(instance_number, queues):
                 order="asc",
                 page="1",
             ),
-            started_job_registry_count=StartedJobRegistry(q.name, connection=q.connection).get_job_count(cleanup=False),
+            started_job_registry_count=stats[q.name]["started_job_registry_count"],
             started_url=url_for(
                 ".jobs_overview",
                 instance_number=instance_number,
@@ -153,7 +619,7 @@ def serialize_queues(instance_number, queues):
                 order="asc",
                 page="1",
             ),
-            deferred_job_registry_count=DeferredJobRegistry(q.name, connection=q.connection).get_job_count(cleanup=False),
+            deferred_job_registry_count=stats[q.name]["deferred_job_registry_count"],
             deferred_url=url_for(
                 ".jobs_overview",
                 instance_number=instance_number,
@@ -163,7 +629,7 @@ def serialize_queues(instance_number, queues):
                 order="asc",
                 page="1",
             ),
-            finished_job_registry_count=FinishedJobRegistry(q.name, connection=q.connection).get_job_count(cleanup=False),
+            finished_job_registry_count=stats[q.name]["finished_job_registry_count"],
             finished_url=url_for(
                 ".jobs_overview",
                 instance_number=instance_number,
@@ -173,7 +639,7 @@ def serialize_queues(instance_number, queues):
                 order="asc",
                 page="1",
             ),
-            canceled_job_registry_count=CanceledJobRegistry(q.name, connection=q.connection).get_job_count(cleanup=False),
+            canceled_job_registry_count=stats[q.name]["canceled_job_registry_count"],
             canceled_url=url_for(
                 ".jobs_overview",
                 instance_number=instance_number,
@@ -183,7 +649,7 @@ def serialize_queues(instance_number, queues):
                 order="asc",
                 page="1",
             ),
-            scheduled_job_registry_count=ScheduledJobRegistry(q.name, connection=q.connection).get_job_count(cleanup=False),
+            scheduled_job_registry_count=stats[q.name]["scheduled_job_registry_count"],
             scheduled_url=url_for(
                 ".jobs_overview",
                 instance_number=instance_number,
@@ -204,15 +670,65 @@ def serialize_date(dt):
     return arrow.get(dt).to("UTC").datetime.isoformat()
 
 
-def serialize_job(job: Job):
-    latest_result = job.latest_result()
+JOB_ROW_FIELDS = ("origin", "status", "created_at", "started_at", "ended_at", "description")
+
+
+def latest_exc_string(raw_result):
+    """Return the exception of an ``XREVRANGE`` result entry, if it has one.
+
+    Only the ``exc_string`` field is decoded; the return value is left alone.
+    """
+    if not raw_result:
+        return None
+    _, payload = raw_result[0]
+    exc_string = payload.get(b"exc_string")
+    if not exc_string:
+        return None
+    return zlib.decompress(b64decode(exc_string)).decode()
+
+
+def fetch_job_rows(job_ids, connection):
+    """Read the fields shown in the job lists, in at most two round trips.
+
+    Only ``JOB_ROW_FIELDS`` are read with ``HMGET``, so the pickled payload of
+    the jobs is neither transferred nor deserialized. The latest results, for
+    their exception, are read in a second pipeline and only for jobs that
+    aren't finished: the latest result of a finished job is a success.
+    Returns one dict per id, or ``None`` for ids whose hash no longer exists.
+    """
+    pipe = connection.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.hmget(Job.key_for(job_id), JOB_ROW_FIELDS)
+    rows = []
+    for job_id, values in zip(job_ids, pipe.execute()):
+        if not any(values):
+            rows.append(None)
+            continue
+        row = {field: as_text(value) if value is not None else None for field, value in zip(JOB_ROW_FIELDS, values)}
+        row.update(id=job_id, exc_info=None)
+        rows.append(row)
+
+    unfinished = [row for row in rows if row is not None and row["status"] != "finished"]
+    if unfinished:
+        pipe = connection.pipeline(transaction=False)
+        for row in unfinished:
+            pipe.xrevrange(Result.get_key(row["id"]), "+", "-", count=1)
+        for row, raw_result in zip(unfinished, pipe.execute()):
+            row["exc_info"] = latest_exc_string(raw_result)
+    return rows
+
+
+def serialize_job(row):
+    def parse_date(value):
+        return utcparse(value) if value else None
+
     return dict(
-        id=job.id,
-        created_at=serialize_date(job.created_at),
-        started_at=serialize_date(job.started_at),
-        ended_at=serialize_date(job.ended_at),
-        exc_info=latest_result.exc_string if latest_result else None,
-        description=job.description,
+        id=row["id"],
+        created_at=serialize_date(parse_date(row["created_at"])),
+        started_at=serialize_date(parse_date(row["started_at"])),
+        ended_at=serialize_date(parse_date(row["ended_at"])),
+        exc_info=row["exc_info"],
+        description=row["description"],
     )
 
 
@@ -253,51 +769,103 @@ def favicon():
     )
 
 
-def get_queue_registry_jobs_count(queue_name, registry_name, offset, per_page, order, connection):
-    queue = Queue(queue_name, serializer=config.serializer, connection=connection)
-    if registry_name != "queued":
-        if per_page >= 0:
-            per_page = offset + (per_page - 1)
-
-        if registry_name == "failed":
-            current_queue = FailedJobRegistry(queue_name, connection=connection)
-        elif registry_name == "deferred":
-            current_queue = DeferredJobRegistry(queue_name, connection=connection)
-        elif registry_name == "started":
-            current_queue = StartedJobRegistry(queue_name, connection=connection)
-        elif registry_name == "finished":
-            current_queue = FinishedJobRegistry(queue_name, connection=connection)
-        elif registry_name == "scheduled":
-            current_queue = ScheduledJobRegistry(queue_name, connection=connection)
-        elif registry_name == "canceled":
-            current_queue = CanceledJobRegistry(queue_name, connection=connection)
-    else:
-        current_queue = queue
+def offset_page(connection, key, is_queue, offset, per_page, descending, total_items):
+    """Return the ``(job_id, position)`` entries of a queue or registry page.
 
-    if isinstance(current_queue, BaseRegistry):
-        total_items = current_queue.get_job_count(cleanup=False)
+    Positions are indexes in a queue and scores in a registry, as used by
+    ``cursors``.
+    """
+    if descending:
+        end = total_items - 1 - offset
+        start = max(0, end - per_page + 1)
+    else:
+        start, end = offset, offset + per_page - 1
+    if end < start:
+        return []
+    if is_queue:
+        entries = [(as_text(job_id), start + n) for n, job_id in enumerate(connection.lrange(key, start, end))]
     else:
-        total_items = current_queue.count
+        entries = [(as_text(job_id), score) for job_id, score in connection.zrange(key, start, end, withscores=True)]
+    if descending:
+        entries.reverse()
+    return entries
+
+
+def get_queue_registry_jobs_count(
+    queue_name, registry_name, offset, per_page, order, connection, serializer=None, cursor=None
+):
+    """Return the job count of a queue or registry and one page of its jobs.
+
+    The page starts at ``offset``, or next to the job named by ``cursor``
+    (see ``cursors``). Returns ``(total_items, jobs, next_cursor, prev_cursor)``
+    where the cursors are ``None`` when there is no page that way.
+    """
+    total_items, entries, next_cursor, prev_cursor = get_page_entries(
+        queue_name, registry_name, offset, per_page, order, connection, cursor
+    )
+    jobs = fetch_page_jobs(queue_name, [job_id for job_id, _ in entries], connection, serializer)
+    return (total_items, jobs, next_cursor, prev_cursor)
 
 
-    if order == 'dsc':
-        end = total_items - offset
-        start = max(0, end - per_page)
-    else:
-        start = offset
-        end = start + per_page
+def get_page_entries(queue_name, registry_name, offset, per_page, order, connection, cursor=None):
+    """Return the job count of a queue or registry and the entries of one page.
 
-    if isinstance(current_queue, BaseRegistry):
-        job_ids = current_queue.get_job_ids(start, end, cleanup=False)
+    Like ``get_queue_registry_jobs_count`` but with the ``(job_id, position)``
+    entries of the page instead of its jobs.
+    """
+    is_queue = registry_name == "queued"
+    if is_queue:
+        key = Queue.redis_queue_namespace_prefix + queue_name
+        total_items = connection.llen(key)
     else:
-        job_ids = current_queue.get_job_ids(start, end)
-    if order == 'dsc':
-        job_ids.reverse()
+        key = REGISTRY_CLASSES[registry_name].key_template.format(queue_name)
+        total_items = connection.zcard(key)
 
-    current_queue_jobs = [queue.fetch_job(job_id) for job_id in job_ids]
-    jobs = [serialize_job(job) for job in current_queue_jobs if job]
-
-    return (total_items, jobs)
+    descending = order == "dsc"
+    if cursor is None:
+        entries = offset_page(connection, key, is_queue, offset, per_page, descending, total_items)
+        has_next, has_prev = offset + per_page < total_items, offset > 0
+    else:
+        direction, position, anchor_id = decode_cursor(cursor)
+        backward = direction == BEFORE
+        if is_queue:
+            entries = queue_page(connection, key, position, anchor_id, per_page + 1, descending != backward)
+        else:
+            entries = registry_page(connection, key, position, anchor_id, per_page + 1, descending != backward)
+        has_more = len(entries) > per_page
+        entries = entries[:per_page]
+        if backward:
+            entries.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, True
+
+    next_cursor = prev_cursor = None
+    if entries and has_next:
+        next_cursor = encode_cursor(AFTER, entries[-1][1], entries[-1][0])
+    if entries and has_prev:
+        prev_cursor = encode_cursor(BEFORE, entries[0][1], entries[0][0])
+    return total_items, entries, next_cursor, prev_cursor
+
+
+def fetch_page_jobs(queue_name, job_ids, connection, serializer=None, prune=True):
+    """Return the serialized jobs of a page of ``queue_name``, skipping vanished jobs.
+
+    With ``prune`` the ids of vanished jobs are also dropped from the queue;
+    read-only callers such as the search pass ``prune=False``.
+    """
+    if serializer is None:
+        serializer = config.serializer
+    queue = Queue(queue_name, serializer=serializer, connection=connection)
+    rows = fetch_job_rows(job_ids, connection)
+    missing_ids = [job_id for job_id, row in zip(job_ids, rows) if row is None]
+    if prune and missing_ids:
+        # Mirror Queue.fetch_job, which drops ids of jobs that no longer exist.
+        with connection.pipeline() as pipe:
+            for job_id in missing_ids:
+                queue.remove(job_id, pipeline=pipe)
+            pipe.execute()
+    return [serialize_job(row) for row in rows if row is not None and row["origin"] == queue_name]
 
 
 def escape_format_instance_list(url_list):
@@ -308,54 +876,76 @@ def escape_format_instance_list(url_list):
     return url_list
 
 
-@blueprint.route("/", defaults={"instance_number": 0})
-@blueprint.route("/<int:instance_number>/")
-@blueprint.route("/<int:instance_number>/view")
-@blueprint.route("/<int:instance_number>/view/queues")
-def queues_overview(instance_number):
-    try:
-        r = make_response(
-            render_template(
-                "rq_dashboard/queues.html",
-                current_instance=instance_number,
-                instance_list=escape_format_instance_list(current_app.config.get("RQ_DASHBOARD_REDIS_URL")),
-                queues=Queue.all(connection=current_app.redis_conn),
-                rq_url_prefix=url_for(".queues_overview"),
-                rq_dashboard_version=rq_dashboard_version,
-                rq_version=rq_version,
-                active_tab="queues",
-                deprecation_options_usage=current_app.config.get(
-                    "DEPRECATED_OPTIONS", False
-                ),
-            )
-        )
-    except RedisConnectionError:
-        r = make_response(
-            "<h1>Connection Error</h1>"
-        )
-    r.headers.set("Cache-Control", "no-store")
-    return r
+def queue_names(instance_number):
+    """Names of the queues of an instance, for the queue selector of the pages.
 
+    Taken from the shared ``queues`` snapshot when there is a fresh one, so
+    rendering costs no Redis call; otherwise read with a single ``SMEMBERS``.
+    """
+    app = current_app._get_current_object()
+    snapshots = get_snapshot_cache(app, partial(get_redis_connection, app))
+    snapshot = snapshots.peek(instance_number, "queues") if snapshots is not None else None
+    if snapshot is not None:
+        queues, _ = snapshot.value
+        return sorted(queue.name for queue in queues)
+    prefix_length = len(Queue.redis_queue_namespace_prefix)
+    return sorted(as_text(key)[prefix_length:] for key in g.redis_conn.smembers(Queue.redis_queues_keys))
 
-@blueprint.route("/<int:instance_number>/view/workers")
-def workers_overview(instance_number):
-    r = make_response(
-        render_template(
-            "rq_dashboard/workers.html",
-            current_instance=instance_number,
+
+def render_page(template_name, **context):
+    """Render one of the HTML pages.
+
+    Pages are static shells whose tables are filled by the JSON endpoints, so
+    browsers may keep them and revalidate with their ETag.
+    """
+    with timed("render"):
+        page = render_template(
+            template_name,
             instance_list=escape_format_instance_list(current_app.config.get("RQ_DASHBOARD_REDIS_URL")),
-            workers=Worker.all(connection=current_app.redis_conn),
             rq_url_prefix=url_for(".queues_overview"),
             rq_dashboard_version=rq_dashboard_version,
             rq_version=rq_version,
-            active_tab="workers",
             deprecation_options_usage=current_app.config.get(
                 "DEPRECATED_OPTIONS", False
             ),
+            **context
         )
+    r = make_response(page)
+    r.headers.set("Cache-Control", "no-cache")
+    r.add_etag()
+    return r.make_conditional(request)
+
+
+@blueprint.route("/", defaults={"instance_number": 0})
+@blueprint.route("/<int:instance_number>/")
+@blueprint.route("/<int:instance_number>/view")
+@blueprint.route("/<int:instance_number>/view/queues")
+def queues_overview(instance_number):
+    return render_page(
+        "rq_dashboard/queues.html",
+        current_instance=instance_number,
+        active_tab="queues",
+        history_interval=current_app.config.get("RQ_DASHBOARD_HISTORY_INTERVAL"),
+    )
+
+
+@blueprint.route("/all/view/queues")
+def all_queues_overview():
+    return render_page(
+        "rq_dashboard/all_queues.html",
+        current_instance=0,
+        all_instances=True,
+        active_tab="queues",
+    )
+
+
+@blueprint.route("/<int:instance_number>/view/workers")
+def workers_overview(instance_number):
+    return render_page(
+        "rq_dashboard/workers.html",
+        current_instance=instance_number,
+        active_tab="workers",
     )
-    r.headers.set("Cache-Control", "no-store")
-    return r
 
 
 @blueprint.route(
@@ -373,137 +963,269 @@ def workers_overview(instance_number):
 )
 def jobs_overview(instance_number, queue_name, registry_name, per_page, order, page):
     if queue_name is None:
-        queue = Queue(serializer=config.serializer, connection=current_app.redis_conn)
+        queue = Queue(serializer=g.serializer, connection=g.redis_conn)
     else:
-        queue = Queue(queue_name, serializer=config.serializer, connection=current_app.redis_conn)
-    r = make_response(
-        render_template(
-            "rq_dashboard/jobs.html",
-            current_instance=instance_number,
-            instance_list=escape_format_instance_list(current_app.config.get("RQ_DASHBOARD_REDIS_URL")),
-            queues=Queue.all(connection=current_app.redis_conn),
-            queue=queue,
-            per_page=per_page,
-            order=order,
-            page=page,
-            registry_name=registry_name,
-            rq_url_prefix=url_for(".queues_overview"),
-            rq_dashboard_version=rq_dashboard_version,
-            rq_version=rq_version,
-            active_tab="jobs",
-            deprecation_options_usage=current_app.config.get(
-                "DEPRECATED_OPTIONS", False
-            ),
-            enable_delete=not current_app.config.get("RQ_DASHBOARD_DISABLE_DELETE"),
-        )
+        queue = Queue(queue_name, serializer=g.serializer, connection=g.redis_conn)
+    return render_page(
+        "rq_dashboard/jobs.html",
+        current_instance=instance_number,
+        queue_names=queue_names(instance_number),
+        queue=queue,
+        per_page=per_page,
+        order=order,
+        page=page,
+        registry_name=registry_name,
+        cursor=request.args.get("cursor"),
+        active_tab="jobs",
+        enable_delete=not current_app.config.get("RQ_DASHBOARD_DISABLE_DELETE"),
     )
-    r.headers.set("Cache-Control", "no-store")
-    return r
 
 
 @blueprint.route("/<int:instance_number>/view/job/<job_id>")
 def job_view(instance_number, job_id):
-    job = Job.fetch(job_id, connection=current_app.redis_conn)
-    r = make_response(
-        render_template(
-            "rq_dashboard/job.html",
-            current_instance=instance_number,
-            instance_list=escape_format_instance_list(current_app.config.get("RQ_DASHBOARD_REDIS_URL")),
-            id=job.id,
-            rq_url_prefix=url_for(".queues_overview"),
-            rq_dashboard_version=rq_dashboard_version,
-            rq_version=rq_version,
-            deprecation_options_usage=current_app.config.get(
-                "DEPRECATED_OPTIONS", False
-            ),
-            enable_delete=not current_app.config.get("RQ_DASHBOARD_DISABLE_DELETE"),
-        )
+    # The job is loaded by the page from job_info; only check that it exists.
+    if not g.redis_conn.exists(Job.key_for(job_id)):
+        abort(404)
+    return render_page(
+        "rq_dashboard/job.html",
+        current_instance=instance_number,
+        id=job_id,
+        enable_delete=not current_app.config.get("RQ_DASHBOARD_DISABLE_DELETE"),
     )
-    r.headers.set("Cache-Control", "no-store")
-    return r
 
 
 @blueprint.route("/job/<job_id>/delete", methods=["POST"])
+@blueprint.route("/<int:instance_number>/job/<job_id>/delete", methods=["POST"])
 @check_delete_enable
 @jsonify
-def delete_job_view(job_id, registry=None):
+def delete_job_view(job_id, instance_number=0):
     try:
-        job = Job.fetch(job_id, connection=current_app.redis_conn)
+        job = Job.fetch(job_id, serializer=g.serializer, connection=g.redis_conn)
         job.delete()
     except NoSuchJobError:
-        if registry:
-            registry.remove(job_id)
         return dict(status="ERROR")
 
     return dict(status="OK")
 
 
 @blueprint.route("/job/<job_id>/requeue", methods=["POST"])
+@blueprint.route("/<int:instance_number>/job/<job_id>/requeue", methods=["POST"])
 @jsonify
-def requeue_job_view(job_id):
-    requeue_job(job_id, connection=current_app.redis_conn)
+def requeue_job_view(job_id, instance_number=0):
+    requeue_job(job_id, connection=g.redis_conn, serializer=g.serializer)
     return dict(status="OK")
 
 
+def start_background_operation(name, total, steps):
+    """Run ``steps`` as a background operation and describe it for the response."""
+    operation = start_operation(current_app._get_current_object(), g.redis_conn, name, total, steps)
+    return dict(
+        status="OK",
+        operation=operation.to_dict(),
+        operation_url=url_for(
+            ".operation_info", instance_number=g.instance_number, operation_id=operation.id
+        ),
+    )
+
+
+def _run_once(func, count):
+    """Steps of an operation done by a single call processing ``count`` jobs."""
+    func()
+    yield count
+
+
+# Moves a chunk of failed job ids back to their queue the way
+# FailedJobRegistry.requeue does, without loading (or unpickling) the jobs.
+# Ids that another client already removed from the registry are left alone;
+# ids whose job hash expired are dropped and counted as skipped.
+#   KEYS: failed registry, queue, set of all queues, job keys...
+#   ARGV: enqueued_at, job ids... (in the order of their keys)
+REQUEUE_FAILED_JOBS_SCRIPT = """
+local requeued, skipped = 0, 0
+for i = 2, #ARGV do
+    local job_id = ARGV[i]
+    if redis.call('zrem', KEYS[1], job_id) == 1 then
+        local job_key = KEYS[i + 2]
+        if redis.call('exists', job_key) == 1 then
+            redis.call('hset', job_key, 'status', 'queued', 'enqueued_at', ARGV[1], 'started_at', '', 'ended_at', '')
+            redis.call('hdel', job_key, 'exc_info')
+            local ttl = tonumber(redis.call('hget', job_key, 'ttl'))
+            if ttl and ttl > 0 then
+                redis.call('expire', job_key, ttl)
+            end
+            redis.call('rpush', KEYS[2], job_id)
+            requeued = requeued + 1
+        else
+            skipped = skipped + 1
+        end
+    end
+end
+if requeued > 0 then
+    redis.call('sadd', KEYS[3], KEYS[2])
+end
+return {requeued, skipped}
+"""
+
+
+def requeue_failed_jobs(queue_name, connection, chunk_size=1000):
+    """Requeue the jobs of a queue's ``FailedJobRegistry`` in chunks.
+
+    Each chunk is read with one ``ZRANGE`` and moved atomically by one script
+    call, so requeueing N jobs costs about 2 * N / chunk_size round trips.
+    Yields the ``requeued`` and ``skipped`` counts of each chunk. Only the
+    jobs present when the call started are processed; jobs failing meanwhile
+    are left for later.
+    """
+    queue = Queue(queue_name, connection=connection)
+    registry = FailedJobRegistry(queue_name, connection=connection)
+    requeue_script = connection.register_script(REQUEUE_FAILED_JOBS_SCRIPT)
+    remaining = registry.get_job_count(cleanup=False)
+    while remaining > 0:
+        job_ids = registry.get_job_ids(0, min(chunk_size, remaining) - 1, cleanup=False)
+        if not job_ids:
+            break
+        job_keys = [Job.redis_job_namespace_prefix + job_id for job_id in job_ids]
+        requeued, skipped = requeue_script(
+            keys=[registry.key, queue.key, Queue.redis_queues_keys] + job_keys,
+            args=[utcformat(now())] + job_ids,
+        )
+        remaining -= len(job_ids)
+        yield dict(requeued=requeued, skipped=skipped)
+
+
 @blueprint.route("/requeue/<queue_name>", methods=["GET", "POST"])
+@blueprint.route("/<int:instance_number>/requeue/<queue_name>", methods=["GET", "POST"])
 @jsonify
-def requeue_all(queue_name):
-    fq = Queue(queue_name, serializer=config.serializer, connection=current_app.redis_conn).failed_job_registry
-    job_ids = fq.get_job_ids(cleanup=False)
-    count = len(job_ids)
-    for job_id in job_ids:
-        requeue_job(job_id, connection=current_app.redis_conn)
-    return dict(status="OK", count=count)
+def requeue_all(queue_name, instance_number=0):
+    chunk_size = int(current_app.config.get("RQ_DASHBOARD_BULK_CHUNK_SIZE", 1000))
+    total = FailedJobRegistry(queue_name, connection=g.redis_conn).get_job_count(cleanup=False)
+    chunks = requeue_failed_jobs(queue_name, g.redis_conn, chunk_size)
+    return dict(start_background_operation("requeue", total, chunks), count=total)
+
+
+def delete_registry_jobs(registry, chunk_size=1000):
+    """Delete the jobs of a registry in fixed-size windows.
+
+    Each window of ids is read with one ``ZRANGE`` and its job hashes,
+    dependency sets, result streams and registry entries are removed in one
+    transaction, so memory use is bounded by ``chunk_size`` whatever the size
+    of the registry. Yields the number of jobs deleted per window. Only the
+    jobs present when the call started are processed.
+    """
+    remaining = registry.get_job_count(cleanup=False)
+    while remaining > 0:
+        job_ids = registry.get_job_ids(0, min(chunk_size, remaining) - 1, cleanup=False)
+        if not job_ids:
+            break
+        keys = []
+        for job_id in job_ids:
+            job_key = Job.redis_job_namespace_prefix + job_id
+            keys.extend((job_key, job_key + ":dependents", job_key + ":dependencies", Result.get_key(job_id)))
+        with registry.connection.pipeline() as pipe:
+            pipe.delete(*keys)
+            pipe.zrem(registry.key, *job_ids)
+            pipe.execute()
+        remaining -= len(job_ids)
+        yield len(job_ids)
 
 
 @blueprint.route("/queue/<queue_name>/<registry_name>/empty", methods=["POST"])
+@blueprint.route("/<int:instance_number>/queue/<queue_name>/<registry_name>/empty", methods=["POST"])
 @check_delete_enable
 @jsonify
-def empty_queue(queue_name, registry_name):
+def empty_queue(queue_name, registry_name, instance_number=0):
     if registry_name == "queued":
-        q = Queue(queue_name, serializer=config.serializer, connection=current_app.redis_conn)
-        q.empty()
-    elif registry_name == "failed":
-        registry = FailedJobRegistry(queue_name, connection=current_app.redis_conn)
-        for id in registry.get_job_ids(cleanup=False):
-            delete_job_view(id, registry)
-    elif registry_name == "deferred":
-        registry = DeferredJobRegistry(queue_name, connection=current_app.redis_conn)
-        for id in registry.get_job_ids(cleanup=False):
-            delete_job_view(id, registry)
-    elif registry_name == "started":
-        registry = StartedJobRegistry(queue_name, connection=current_app.redis_conn)
-        for id in registry.get_job_ids(cleanup=False):
-            delete_job_view(id, registry)
-    elif registry_name == "finished":
-        registry = FinishedJobRegistry(queue_name, connection=current_app.redis_conn)
-        for id in registry.get_job_ids(cleanup=False):
-            delete_job_view(id, registry)
-    elif registry_name == "canceled":
-        registry = CanceledJobRegistry(queue_name, connection=current_app.redis_conn)
-        for id in registry.get_job_ids(cleanup=False):
-            delete_job_view(id, registry)
-    elif registry_name == "scheduled":
-        registry = ScheduledJobRegistry(queue_name, connection=current_app.redis_conn)
-        for id in registry.get_job_ids(cleanup=False):
-            delete_job_view(id, registry)
+        q = Queue(queue_name, serializer=g.serializer, connection=g.redis_conn)
+        return start_background_operation("empty", q.count, _run_once(q.empty, q.count))
+    elif registry_name in REGISTRY_CLASSES:
+        registry = REGISTRY_CLASSES[registry_name](queue_name, connection=g.redis_conn)
+        chunk_size = int(current_app.config.get("RQ_DASHBOARD_BULK_CHUNK_SIZE", 1000))
+        return start_background_operation(
+            "empty", registry.get_job_count(cleanup=False), delete_registry_jobs(registry, chunk_size)
+        )
 
     return dict(status="OK")
 
 
 @blueprint.route("/queue/<queue_name>/compact", methods=["POST"])
+@blueprint.route("/<int:instance_number>/queue/<queue_name>/compact", methods=["POST"])
 @jsonify
-def compact_queue(queue_name):
-    q = Queue(queue_name, serializer=config.serializer, connection=current_app.redis_conn)
-    q.compact()
-    return dict(status="OK")
+def compact_queue(queue_name, instance_number=0):
+    q = Queue(queue_name, serializer=g.serializer, connection=g.redis_conn)
+    return start_background_operation("compact", q.count, _run_once(q.compact, q.count))
+
+
+@blueprint.route("/<int:instance_number>/data/operations/<operation_id>.json")
+@jsonify
+def operation_info(instance_number, operation_id):
+    operation = Operation.fetch(g.redis_conn, operation_id)
+    if operation is None:
+        abort(404)
+    return operation.to_dict()
 
 
 @blueprint.route("/<int:instance_number>/data/queues.json")
 @jsonify
 def list_queues(instance_number):
-    queues = serialize_queues(instance_number, sorted(Queue.all(connection=current_app.redis_conn)))
-    return dict(queues=queues)
+    (queues, stats), headers = snapshot_or_collect(
+        instance_number, "queues", queues_collector(current_app, instance_number)
+    )
+    return dict(queues=serialize_queues(instance_number, queues, stats)), headers
+
+
+@blueprint.route("/<int:instance_number>/data/history.json")
+@jsonify
+def list_queue_histories(instance_number):
+    """Sampled job counts of every queue of an instance, as ``queue_history`` returns them."""
+    history = get_history(current_app._get_current_object())
+    if history is None:
+        abort(404)
+    histories = history.read_many(instance_number, queue_names(instance_number))
+    return dict(
+        interval=history.interval,
+        queues=[
+            dict(name=queue_name, timestamps=timestamps, **series)
+            for queue_name, (timestamps, series) in histories.items()
+        ],
+    )
+
+
+@blueprint.route("/<int:instance_number>/data/history/<queue_name>.json")
+@jsonify
+def queue_history(instance_number, queue_name):
+    """Sampled job counts of a queue, oldest first, with their times in seconds."""
+    history = get_history(current_app._get_current_object())
+    if history is None:
+        abort(404)
+    timestamps, series = history.read(instance_number, queue_name)
+    return dict(name=queue_name, interval=history.interval, timestamps=timestamps, **series)
+
+
+def serialize_all_queues(results):
+    """Merge ``(instance_number, (queues, stats), error)`` results of every instance."""
+    instance_list = escape_format_instance_list(current_app.config.get("RQ_DASHBOARD_REDIS_URL"))
+    instances = []
+    queues = []
+    for instance_number, result, error in results:
+        instances.append(
+            dict(
+                instance_number=instance_number,
+                url=instance_list[instance_number],
+                reachable=error is None,
+                error=error,
+            )
+        )
+        if result is not None:
+            for queue in serialize_queues(instance_number, *result):
+                queue["instance_number"] = instance_number
+                queues.append(queue)
+    return dict(instances=instances, queues=queues)
+
+
+@blueprint.route("/all/data/queues.json")
+@jsonify
+def list_all_queues():
+    return serialize_all_queues(collect_from_all_instances("queues", queues_collector))
 
 
 @blueprint.route(
@@ -515,9 +1237,13 @@ def list_jobs(instance_number, queue_name, registry_name, per_page, order, page)
     per_page = int(per_page)
     offset = (current_page - 1) * per_page
 
-    total_items, jobs = get_queue_registry_jobs_count(
-        queue_name, registry_name, offset, per_page, order, current_app.redis_conn
-    )
+    try:
+        total_items, jobs, next_cursor, prev_cursor = get_queue_registry_jobs_count(
+            queue_name, registry_name, offset, per_page, order, g.redis_conn, g.serializer,
+            cursor=request.args.get("cursor"),
+        )
+    except ValueError:
+        abort(400)
 
     pages_numbers_in_window = pagination_window(total_items, current_page, per_page)
     pages_in_window = [
@@ -537,8 +1263,10 @@ def list_jobs(instance_number, queue_name, registry_name, per_page, order, page)
     ]
     last_page = int(ceil(total_items / float(per_page)))
 
+    # Previous and next pages are reached with cursors, which stay cheap and
+    # stable however deep the page is; the page number is only displayed.
     prev_page = None
-    if current_page > 1:
+    if prev_cursor is not None:
         prev_page = dict(
             url=url_for(
                 ".jobs_overview",
@@ -547,12 +1275,13 @@ def list_jobs(instance_number, queue_name, registry_name, per_page, order, page)
                 registry_name=registry_name,
                 per_page=per_page,
                 order=order,
-                page=(current_page - 1),
+                page=max(1, current_page - 1),
+                cursor=prev_cursor,
             )
         )
 
     next_page = None
-    if current_page < last_page:
+    if next_cursor is not None:
         next_page = dict(
             url=url_for(
                 ".jobs_overview",
@@ -562,6 +1291,7 @@ def list_jobs(instance_number, queue_name, registry_name, per_page, order, page)
                 per_page=per_page,
                 order=order,
                 page=(current_page + 1),
+                cursor=next_cursor,
             )
         )
 
@@ -605,12 +1335,108 @@ def list_jobs(instance_number, queue_name, registry_name, per_page, order, page)
     )
 
 
+def parse_search_filters(args):
+    """Return the job filters of a search request; raises ``ValueError`` for bad dates."""
+    filters = dict(
+        text=args.get("q", "").lower(),
+        func=args.get("func", ""),
+        description=args.get("description", "").lower(),
+        exc=args.get("exc", "").lower(),
+        since=None,
+        until=None,
+    )
+    for bound in ("since", "until"):
+        if args.get(bound):
+            filters[bound] = arrow.get(args[bound]).to("UTC").datetime
+    return filters
+
+
+def job_matches(job, filters):
+    """Tell whether a serialized job row passes every search filter."""
+    description = (job["description"] or "").lower()
+    exc_info = (job["exc_info"] or "").lower()
+    if filters["text"] and filters["text"] not in description and filters["text"] not in exc_info:
+        return False
+    if filters["func"] and filters["func"] not in (job["description"] or "").split("(", 1)[0]:
+        return False
+    if filters["description"] and filters["description"] not in description:
+        return False
+    if filters["exc"] and filters["exc"] not in exc_info:
+        return False
+    if filters["since"] or filters["until"]:
+        if job["created_at"] is None:
+            return False
+        created_at = arrow.get(job["created_at"]).datetime
+        if filters["since"] and created_at < filters["since"]:
+            return False
+        if filters["until"] and created_at > filters["until"]:
+            return False
+    return True
+
+
+# Most matches a search sends back, whatever its ``limit``.
+SEARCH_MAX_LIMIT = 1000
+
+
+@blueprint.route("/<int:instance_number>/data/search/<queue_name>/<registry_name>/<order>.json")
+def search_jobs(instance_number, queue_name, registry_name, order):
+    """Stream the jobs of a queue or registry that match the search filters.
+
+    Filters are query arguments: ``q`` (in the description or exception,
+    case-insensitive), ``func``, ``description``, ``exc``, and ``since`` /
+    ``until`` bounds on the creation date. Jobs are scanned in windows of
+    ``RQ_DASHBOARD_SEARCH_BATCH_SIZE`` and each window's matches are sent
+    right away, one JSON document per line. The scan stops at the end of
+    the window where ``RQ_DASHBOARD_SEARCH_BUDGET`` jobs were scanned or
+    ``limit`` matches found; the last line then holds the ``cursor`` to
+    resume from with ``?cursor=``.
+    """
+    if registry_name != "queued" and registry_name not in REGISTRY_CLASSES:
+        abort(404)
+    try:
+        filters = parse_search_filters(request.args)
+        if request.args.get("cursor"):
+            decode_cursor(request.args["cursor"])
+        limit = int(request.args.get("limit", 100))
+    except ValueError:
+        abort(400)
+    if limit < 1:
+        abort(400)
+    limit = min(limit, SEARCH_MAX_LIMIT)
+    batch_size = int(current_app.config.get("RQ_DASHBOARD_SEARCH_BATCH_SIZE", 500))
+    budget = int(current_app.config.get("RQ_DASHBOARD_SEARCH_BUDGET", 50000))
+
+    def generate():
+        cursor = request.args.get("cursor") or None
+        scanned = matched = 0
+        while True:
+            _, entries, cursor, _ = get_page_entries(
+                queue_name, registry_name, 0, batch_size, order, g.redis_conn, cursor=cursor
+            )
+            scanned += len(entries)
+            jobs = fetch_page_jobs(
+                queue_name, [job_id for job_id, _ in entries], g.redis_conn, g.serializer, prune=False
+            )
+            for job in jobs:
+                if job_matches(job, filters):
+                    matched += 1
+                    yield current_app.json.dumps(dict(job=job)) + "\n"
+            if cursor is None or scanned >= budget or matched >= limit:
+                break
+        yield current_app.json.dumps(dict(scanned=scanned, matched=matched, cursor=cursor)) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
 @blueprint.route("/<int:instance_number>/data/job/<job_id>.json")
 @jsonify
 def job_info(instance_number, job_id):
-    job = Job.fetch(job_id, serializer=config.serializer, connection=current_app.redis_conn)
-    latest_result = job.latest_result()
-    json_encoder = current_app.config.get("RQ_DASHBOARD_JSON_ENCODER", json.JSONEncoder)
+    job = Job.fetch(job_id, serializer=g.serializer, connection=g.redis_conn)
+    latest_entry = latest_result_entry(job.id, g.redis_conn)
     result = dict(
         id=job.id,
         created_at=serialize_date(job.created_at),
@@ -619,55 +1445,430 @@ def job_info(instance_number, job_id):
         ended_at=serialize_date(job.ended_at),
         origin=job.origin,
         status=job.get_status(),
-        result=job.return_value(),
-        exc_info=latest_result.exc_string if latest_result else None,
         description=job.description,
-        metadata=json.dumps(job.get_meta(), cls=json_encoder)
-    )
-    dep_ids = [di.decode("utf-8").split(':')[-1].strip() for di in job.dependency_ids]
-    if len(dep_ids) > 0:
-        result["depends_on"] = dep_ids
-        status = []
-        for dep_id in dep_ids:
-            try:
-                _ = Job.fetch(dep_id, serializer=config.serializer, connection=current_app.redis_conn)
-                status.append('active')
-            except NoSuchJobError:
-                status.append('expired')
-        result["depends_on_status"] = status
+    )
+    for field in JOB_FIELDS:
+        result.update(preview_job_field(job, field, latest_entry))
+    dep_ids = fetch_dependency_ids(job.id, g.redis_conn)
+    if dep_ids:
+        result.update(serialize_dependencies(job.id, dep_ids, 1))
     return result
 
 
+JOB_FIELDS = ("result", "exc_info", "metadata")
+
+
+def latest_result_entry(job_id, connection):
+    """Return the ``(result_id, payload)`` of a job's latest result, still encoded, or ``None``."""
+    raw_result = connection.xrevrange(Result.get_key(job_id), "+", "-", count=1)
+    if not raw_result:
+        return None
+    result_id, payload = raw_result[0]
+    return as_text(result_id), payload
+
+
+def dumps_return_value(value):
+    """Encode a return value like the JSON responses do, as text for types they can't encode."""
+    def default(o):
+        try:
+            return current_app.json.default(o)
+        except (AttributeError, TypeError):
+            return str(o)
+
+    return current_app.json.dumps(value, indent=2, default=default)
+
+
+def job_field_text(job, field, latest_result):
+    """Return the text of one of ``JOB_FIELDS``, or ``None`` when the job has none."""
+    if field == "result":
+        if latest_result is None or latest_result.type != Result.Type.SUCCESSFUL:
+            return None
+        return dumps_return_value(latest_result.return_value)
+    if field == "exc_info":
+        return latest_result.exc_string if latest_result else None
+    json_encoder = current_app.config.get("RQ_DASHBOARD_JSON_ENCODER", json.JSONEncoder)
+    return json.dumps(job.meta, cls=json_encoder)
+
+
+def text_preview(text, limit):
+    """Return the ``(preview, size, truncated)`` of a field's text."""
+    return text[:limit], len(text.encode("utf-8")), len(text) > limit
+
+
+def preview_job_field(job, field, latest_entry):
+    """Return the preview of a job field for ``job_info``.
+
+    Only the first ``RQ_DASHBOARD_PREVIEW_SIZE`` characters (2048 by default)
+    are sent, along with the full size in bytes and the URL of the whole
+    value, so polling the job page stays cheap however big the result is.
+    The exception is read straight from the result entry, and the result
+    preview is computed once per result, see ``previews``.
+    """
+    limit = int(current_app.config.get("RQ_DASHBOARD_PREVIEW_SIZE", 2048))
+    if field == "result":
+        if latest_entry is None or int(latest_entry[1].get(b"type", 0)) != Result.Type.SUCCESSFUL.value:
+            return {field: None}
+        result_id, payload = latest_entry
+
+        def compute():
+            result = Result.restore(job.id, result_id, payload, connection=g.redis_conn, serializer=g.serializer)
+            return text_preview(dumps_return_value(result.return_value), limit)
+
+        key = (g.instance_number, job.id, result_id, limit)
+        preview = get_preview_cache(current_app._get_current_object()).get(key, compute)
+    else:
+        if field == "exc_info":
+            text = latest_exc_string([latest_entry] if latest_entry else None)
+        else:
+            text = job_field_text(job, field, None)
+        if text is None:
+            return {field: None}
+        preview = text_preview(text, limit)
+    text, size, truncated = preview
+    return {
+        field: text,
+        "{}_size".format(field): size,
+        "{}_truncated".format(field): truncated,
+        "{}_url".format(field): url_for(
+            ".job_field", instance_number=g.instance_number, job_id=job.id, field=field
+        ),
+    }
+
+
+@blueprint.route("/<int:instance_number>/data/job/<job_id>/<any(result, exc_info, metadata):field>")
+def job_field(instance_number, job_id, field):
+    """Stream the whole value of a job field, as a download with ``?download=1``."""
+    try:
+        job = Job.fetch(job_id, serializer=g.serializer, connection=g.redis_conn)
+    except NoSuchJobError:
+        abort(404)
+    text = job_field_text(job, field, job.latest_result())
+    if text is None:
+        abort(404)
+    chunk_size = 64 * 1024
+
+    def generate():
+        for start in range(0, len(text), chunk_size):
+            yield text[start:start + chunk_size]
+
+    mimetype = "text/plain" if field == "exc_info" else "application/json"
+    response = Response(generate(), mimetype=mimetype, headers={"Cache-Control": "no-store"})
+    if request.args.get("download"):
+        extension = "txt" if field == "exc_info" else "json"
+        response.headers["Content-Disposition"] = "attachment; filename={}-{}.{}".format(
+            job.id, field, extension
+        )
+    return response
+
+
+def check_profiling_token():
+    """Abort unless profiling is on and the request carries its token."""
+    if profiling_token(current_app) is None:
+        abort(404)
+    if not token_matches(current_app, request.headers.get("X-Profile-Token") or request.args.get("profile")):
+        abort(403)
+
+
+@blueprint.route("/<int:instance_number>/data/_profiles.json")
+@jsonify
+def list_profiles(instance_number):
+    """The stored profiles of requests to the instance, latest first."""
+    check_profiling_token()
+    profiles = Profile.list(g.redis_conn)
+    for profile in profiles:
+        profile["url"] = url_for(
+            ".profile_download", instance_number=instance_number, profile_id=profile["id"], format="pstats"
+        )
+    return dict(profiles=profiles)
+
+
+@blueprint.route("/<int:instance_number>/data/_profiles/<profile_id>.<any(pstats, txt):format>")
+def profile_download(instance_number, profile_id, format):
+    """Download a profile for ``pstats``/snakeviz, or read its cumulative time summary."""
+    check_profiling_token()
+    profile = Profile.fetch(g.redis_conn, profile_id)
+    if profile is None:
+        abort(404)
+    if format == "txt":
+        return Response(profile.summary(), mimetype="text/plain", headers={"Cache-Control": "no-store"})
+    return Response(
+        profile.dump(),
+        mimetype="application/octet-stream",
+        headers={
+            "Cache-Control": "no-store",
+            "Content-Disposition": "attachment; filename={}.pstats".format(profile_id),
+        },
+    )
+
+
+def fetch_job_statuses(job_ids, connection):
+    """Return the status of each job, read in one round trip.
+
+    Jobs whose hash no longer exists are reported as ``expired``.
+    """
+    pipe = connection.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.hget(Job.key_for(job_id), "status")
+    return [as_text(status) if status is not None else "expired" for status in pipe.execute()]
+
+
+def fetch_dependency_ids(job_id, connection):
+    """Return the ids a job depends on, in the order they were declared.
+
+    They are read from the job hash, unlike ``Job.dependency_ids`` whose set
+    loses that order. Returns ``None`` when the job doesn't exist.
+    """
+    job_key = Job.key_for(job_id)
+    pipe = connection.pipeline(transaction=False)
+    pipe.exists(job_key)
+    pipe.hmget(job_key, "dependency_ids", "dependency_id")
+    exists, (dep_ids, dep_id) = pipe.execute()
+    if not exists:
+        return None
+    if dep_ids:
+        return json.loads(as_text(dep_ids))
+    # Jobs saved by RQ before 1.8 have a single dependency_id.
+    return [as_text(dep_id)] if dep_id else []
+
+
+def serialize_dependencies(job_id, dep_ids, page):
+    """Return one page of the dependencies of a job along with their statuses.
+
+    Pages hold ``RQ_DASHBOARD_DEPENDENCIES_PER_PAGE`` dependencies (100 by
+    default) so jobs with a huge fan-in don't load all their parents at once.
+    """
+    per_page = int(current_app.config.get("RQ_DASHBOARD_DEPENDENCIES_PER_PAGE", 100))
+    page_ids = dep_ids[(page - 1) * per_page:page * per_page]
+    next_url = None
+    if page * per_page < len(dep_ids):
+        next_url = url_for(
+            ".job_dependencies",
+            instance_number=g.instance_number,
+            job_id=job_id,
+            page=page + 1,
+        )
+    return dict(
+        depends_on=page_ids,
+        depends_on_status=fetch_job_statuses(page_ids, g.redis_conn),
+        depends_on_count=len(dep_ids),
+        depends_on_next_url=next_url,
+    )
+
+
+@blueprint.route("/<int:instance_number>/data/job/<job_id>/dependencies/<int:page>.json")
+@jsonify
+def job_dependencies(instance_number, job_id, page):
+    dep_ids = fetch_dependency_ids(job_id, g.redis_conn)
+    if dep_ids is None:
+        abort(404)
+    return serialize_dependencies(job_id, dep_ids, page)
+
+
+def parse_worker_hashes(worker_keys, raw_hashes):
+    """Return ``(name, fields)`` tuples with the hash fields decoded to text.
+
+    Workers whose hash expired but are still registered are skipped.
+    """
+    prefix_length = len(Worker.redis_worker_namespace_prefix)
+    return [
+        (key[prefix_length:], {as_text(k): as_text(v) for k, v in raw.items()})
+        for key, raw in zip(worker_keys, raw_hashes)
+        if raw
+    ]
+
+
+def fetch_workers(connection):
+    """Read the hashes of all registered workers in one round trip."""
+    worker_keys = sorted(as_text(key) for key in connection.smembers(Worker.redis_workers_keys))
+    pipe = connection.pipeline(transaction=False)
+    for key in worker_keys:
+        pipe.hgetall(key)
+    return parse_worker_hashes(worker_keys, pipe.execute())
+
+
+def serialize_workers(workers, current_jobs):
+    """Serialize ``fetch_workers`` output, sorted by state and queues.
+
+    ``current_jobs`` maps the ids of the jobs being worked on to their
+    ``Job``, or ``None`` when the job no longer exists.
+    """
+    def parse_date(value):
+        return utcparse(value) if value else None
+
+    def serialize_worker(name, fields):
+        queues = fields.get("queues")
+        return dict(
+            name=name,
+            pid=int(fields["pid"]) if fields.get("pid") else None,
+            queues=queues.split(",") if queues else [],
+            state=fields.get("state") or "?",
+            current_job=serialize_current_job(current_jobs.get(fields.get("current_job"))),
+            last_heartbeat=parse_date(fields.get("last_heartbeat")),
+            birth_date=parse_date(fields.get("birth")),
+            successful_job_count=int(fields.get("successful_job_count") or 0),
+            failed_job_count=int(fields.get("failed_job_count") or 0),
+            total_working_time=float(fields.get("total_working_time") or 0),
+            version=fields.get("version") or "",
+            python_version=fields.get("python_version") or "",
+        )
+
+    return sorted(
+        (serialize_worker(name, fields) for name, fields in workers),
+        key=lambda w: (w["state"], w["queues"], w["name"]),
+    )
+
+
+def collect_workers(connection, serializer=None):
+    """Return the serialized workers of an instance, sorted by state and queues.
+
+    Worker hashes are read with one pipelined sweep and their current jobs
+    with one more, so the cost doesn't grow with the number of round trips.
+    The current jobs are loaded with ``serializer``, the instance's.
+    """
+    workers = fetch_workers(connection)
+    current_job_ids = [fields["current_job"] for _, fields in workers if fields.get("current_job")]
+    current_jobs = dict(
+        zip(current_job_ids, Job.fetch_many(current_job_ids, connection=connection, serializer=serializer))
+    )
+    return serialize_workers(workers, current_jobs)
+
+
+def workers_collector(app, instance_number):
+    """Return ``collect_workers`` bound to the serializer of the instance."""
+    return partial(collect_workers, serializer=get_serializer(app, instance_number))
+
+
 @blueprint.route("/<int:instance_number>/data/workers.json")
 @jsonify
 def list_workers(instance_number):
-    def serialize_queue_names(worker):
-        return [q.name for q in worker.queues]
+    workers, headers = snapshot_or_collect(
+        instance_number, "workers", workers_collector(current_app, instance_number)
+    )
+    return dict(workers=workers), headers
 
-    workers = sorted(
-        (
-            dict(
-                name=worker.name,
-                pid=worker.pid,
-                queues=serialize_queue_names(worker),
-                state=str(worker.get_state()),
-                current_job=serialize_current_job(worker.get_current_job()),
-                last_heartbeat=worker.last_heartbeat,
-                birth_date=worker.birth_date,
-                successful_job_count=worker.successful_job_count,
-                failed_job_count=worker.failed_job_count,
-                total_working_time=worker.total_working_time,
-                version=getattr(worker, "version", ""),
-                python_version=getattr(worker, "python_version", ""),
-            )
-            for worker in Worker.all(connection=current_app.redis_conn)
-        ),
-        key=lambda w: (w["state"], w["queues"], w["name"]),
+
+@blueprint.route("/<int:instance_number>/data/_perf.json")
+@jsonify
+def perf_stats(instance_number):
+    """Latency histograms and mean Redis usage of each route, for this process."""
+    if not perf_enabled(current_app):
+        abort(404)
+    return get_recorder(current_app._get_current_object()).to_dict(instance_number)
+
+
+@blueprint.route("/metrics")
+def metrics():
+    """Prometheus metrics of every instance, collected at most once per minimum interval."""
+    def collect():
+        queues = [
+            (instance_number, value[1] if value is not None else None, error)
+            for instance_number, value, error in collect_from_all_instances("queues", queues_collector)
+        ]
+        return render_metrics(queues, collect_from_all_instances("workers", workers_collector))
+
+    page, age = get_metrics_cache(current_app._get_current_object()).get(collect)
+    return Response(
+        page,
+        content_type=METRICS_CONTENT_TYPE,
+        headers={"Cache-Control": "no-store", "X-Metrics-Age": "{:.3f}".format(age)},
+    )
+
+
+def event_stream(payload):
+    """Stream the result of ``payload()`` as server-sent events.
+
+    The streams of the same URL share one channel (see ``streams``) that
+    re-evaluates ``payload`` every poll interval, in a request context like
+    the stream's own; an event is only sent when its ETag changed, with a
+    comment line as heartbeat otherwise. At most ``RQ_DASHBOARD_MAX_STREAMS``
+    streams (100 by default) are open at once, further ones get a 503 and the
+    page polls instead. Streams end after ``RQ_DASHBOARD_STREAM_TIMEOUT``
+    seconds so they don't pin a server thread forever; browsers reconnect on
+    their own.
+    """
+    if not current_app.config.get("RQ_DASHBOARD_STREAMS"):
+        abort(404)
+    app = current_app._get_current_object()
+    interval = float(app.config.get("RQ_DASHBOARD_POLL_INTERVAL", 2500)) / 1000
+    timeout = float(app.config.get("RQ_DASHBOARD_STREAM_TIMEOUT", 300))
+    hub = get_stream_hub(app, interval, int(app.config.get("RQ_DASHBOARD_MAX_STREAMS", 100)))
+    environ = dict(request.environ, **{"wsgi.input": io.BytesIO()})
+
+    def evaluate():
+        with app.request_context(environ):
+            push_rq_connection()
+            result = payload()
+            if isinstance(result, tuple):
+                result = result[0]
+            return app.json.dumps(result)
+
+    try:
+        channel = hub.subscribe(request.full_path, evaluate)
+    except TooManyStreams:
+        abort(503)
+    try:
+        version, data = channel.wait(0, timeout)
+    except NoSuchJobError:
+        hub.unsubscribe(channel)
+        abort(404)
+    except BaseException:
+        hub.unsubscribe(channel)
+        raise
+
+    def generate():
+        nonlocal version, data
+        deadline = time.monotonic() + timeout
+        try:
+            yield "retry: {}\n\n".format(int(interval * 1000))
+            while True:
+                if data is not None:
+                    yield "data: {}\n\n".format(data)
+                else:
+                    yield ": heartbeat\n\n"
+                if time.monotonic() >= deadline:
+                    return
+                try:
+                    version, data = channel.wait(version, interval)
+                except Exception:
+                    return
+        finally:
+            hub.unsubscribe(channel)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+@blueprint.route("/<int:instance_number>/stream/queues")
+def stream_queues(instance_number):
+    return event_stream(partial(list_queues.__wrapped__, instance_number))
+
+
+@blueprint.route("/<int:instance_number>/stream/workers")
+def stream_workers(instance_number):
+    return event_stream(partial(list_workers.__wrapped__, instance_number))
+
+
+@blueprint.route(
+    "/<int:instance_number>/stream/jobs/<queue_name>/<registry_name>/<per_page>/<order>/<page>"
+)
+def stream_jobs(instance_number, queue_name, registry_name, per_page, order, page):
+    return event_stream(
+        partial(list_jobs.__wrapped__, instance_number, queue_name, registry_name, per_page, order, page)
     )
-    return dict(workers=workers)
+
+
+@blueprint.route("/<int:instance_number>/stream/job/<job_id>")
+def stream_job(instance_number, job_id):
+    return event_stream(partial(job_info.__wrapped__, instance_number, job_id))
 
 
 @blueprint.context_processor
 def inject_interval():
     interval = current_app.config.get("RQ_DASHBOARD_POLL_INTERVAL", 2500)
-    return dict(poll_interval=interval)
+    return dict(
+        poll_interval=interval,
+        use_streams=bool(current_app.config.get("RQ_DASHBOARD_STREAMS")),
+    )
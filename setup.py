@@ -32,6 +32,9 @@ setup(
     zip_safe=False,
     platforms='any',
     install_requires=['rq>=1.0', 'Flask', 'redis', 'arrow', 'redis-sentinel-url'],
+    extras_require={
+        'asgi': ['asgiref'],
+    },
     entry_points={
         'console_scripts': [
             'rq-dashboard = rq_dashboard.cli:main'
@@ -0,0 +1,180 @@
+"""Benchmark the polled endpoints of the dashboard against a seeded Redis.
+
+Run from the repository root with a local redis-server::
+
+    python -m tests.benchmarks --shape small
+    python -m tests.benchmarks --shape full --save baseline.json
+    python -m tests.benchmarks --no-seed --baseline baseline.json
+
+The database of ``--redis-url`` (``redis://127.0.0.1:6379/15`` by default) is
+flushed and seeded with the shape first, see ``seed``. Each endpoint is then
+requested ``--iterations`` times through the Flask test client, in a process
+of its own so that its peak RSS is its own, and reported with its latency
+percentiles, the Redis commands and round trips of a request and the peak RSS
+of the process.
+
+With ``--baseline``, the exit status is 1 when an endpoint got more than
+``--tolerance`` slower at the median, or sends more Redis commands, than in
+the saved baseline.
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+import redis
+from redis.connection import Connection
+
+from rq_dashboard.cli import make_flask_app
+
+from .seed import FINISHED_QUEUE, SHAPES, seed
+
+LARGE_RESULTS_KEY = "bench:large-results"
+
+
+def endpoints(connection, per_page=50):
+    """Return the ``(name, url)`` of the benchmarked endpoints for the seeded data."""
+    finished = connection.zcard("rq:finished:{}".format(FINISHED_QUEUE))
+    large_result_id = connection.lindex(LARGE_RESULTS_KEY, 0)
+    urls = [
+        ("list_queues", "/0/data/queues.json"),
+        ("list_jobs", "/0/data/jobs/{}/finished/{}/asc/1.json".format(FINISHED_QUEUE, per_page)),
+        (
+            "list_jobs (middle page)",
+            "/0/data/jobs/{}/finished/{}/asc/{}.json".format(FINISHED_QUEUE, per_page, max(1, finished // per_page // 2)),
+        ),
+        ("list_workers", "/0/data/workers.json"),
+    ]
+    if large_result_id is not None:
+        urls.append(("job_info (large result)", "/0/data/job/{}.json".format(large_result_id.decode())))
+    return urls
+
+
+def measure(redis_url, url, iterations, warmup):
+    """Request ``url`` repeatedly and return its statistics; run in a child process."""
+    app = make_flask_app(None, None, None, "")
+    app.config["RQ_DASHBOARD_REDIS_URL"] = [redis_url]
+    client = app.test_client()
+    stats_connection = redis.Redis.from_url(redis_url)
+
+    for _ in range(warmup):
+        client.get(url)
+
+    round_trips = [0]
+    send_packed_command = Connection.send_packed_command
+
+    def counting_send(self, *args, **kwargs):
+        round_trips[0] += 1
+        return send_packed_command(self, *args, **kwargs)
+
+    latencies = []
+    commands_before = stats_connection.info("stats")["total_commands_processed"]
+    with patch.object(Connection, "send_packed_command", counting_send):
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = client.get(url)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError("{} answered {}".format(url, response.status_code))
+    # The first INFO call is counted in the second one's total.
+    commands = stats_connection.info("stats")["total_commands_processed"] - commands_before - 1
+
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    else:
+        percentiles = latencies * 99
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak_rss *= 1024
+    return dict(
+        p50=percentiles[49] * 1000,
+        p90=percentiles[89] * 1000,
+        p99=percentiles[98] * 1000,
+        max=max(latencies) * 1000,
+        commands=commands / iterations,
+        round_trips=round_trips[0] / iterations,
+        peak_rss=peak_rss / (1 << 20),
+    )
+
+
+def run(redis_url, iterations, warmup):
+    connection = redis.Redis.from_url(redis_url)
+    results = {}
+    # Fresh interpreters, so every endpoint's peak RSS starts from the same baseline.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for name, url in endpoints(connection):
+            results[name] = pool.apply(measure, (redis_url, url, iterations, warmup))
+    return results
+
+
+def report(results):
+    header = "{:<26} {:>9} {:>9} {:>9} {:>9} {:>10} {:>11} {:>13}".format(
+        "endpoint", "p50 ms", "p90 ms", "p99 ms", "max ms", "cmds/req", "trips/req", "peak RSS MiB"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            "{:<26} {:>9.2f} {:>9.2f} {:>9.2f} {:>9.2f} {:>10.1f} {:>11.1f} {:>13.1f}".format(
+                name, r["p50"], r["p90"], r["p99"], r["max"], r["commands"], r["round_trips"], r["peak_rss"]
+            )
+        )
+
+
+def regressions(results, baseline, tolerance):
+    """Return a description of every endpoint that regressed compared to ``baseline``."""
+    found = []
+    for name, r in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if r["p50"] > before["p50"] * (1 + tolerance):
+            found.append("{}: p50 {:.2f} ms, was {:.2f} ms".format(name, r["p50"], before["p50"]))
+        if r["commands"] > before["commands"]:
+            found.append("{}: {:.1f} commands per request, was {:.1f}".format(name, r["commands"], before["commands"]))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--redis-url", default="redis://127.0.0.1:6379/15", help="database flushed and seeded")
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="small")
+    for option in sorted(SHAPES["small"]):
+        parser.add_argument("--" + option.replace("_", "-"), type=int, help="overrides the shape")
+    parser.add_argument("--no-seed", action="store_true", help="reuse the data of a previous run")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="fail on regressions against saved results")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown (default 0.2)")
+    args = parser.parse_args(argv)
+
+    if not args.no_seed:
+        shape = dict(SHAPES[args.shape])
+        for option in shape:
+            if getattr(args, option) is not None:
+                shape[option] = getattr(args, option)
+        connection = redis.Redis.from_url(args.redis_url)
+        started = time.perf_counter()
+        large_result_ids = seed(connection, **shape)
+        if large_result_ids:
+            connection.rpush(LARGE_RESULTS_KEY, *large_result_ids)
+        print("Seeded {} in {:.1f}s".format(shape, time.perf_counter() - started))
+
+    results = run(args.redis_url, args.iterations, args.warmup)
+    report(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for description in found:
+            print("REGRESSION " + description)
+        return 1 if found else 0
+    return 0
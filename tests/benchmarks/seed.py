@@ -0,0 +1,128 @@
+"""Seed a Redis database with a benchmark shape.
+
+Like ``tests.fixtures``, jobs are written as ``(key, ttl, DUMP payload)``
+entries restored with ``RESTORE``: one template job is created through RQ and
+dumped, then restored under every job key, so millions of realistic job hashes
+are written in pipelined batches without going through ``Queue.enqueue``.
+"""
+import time
+import uuid
+
+from rq import Queue, Worker
+from rq.defaults import DEFAULT_RESULT_TTL
+from rq.job import Job
+from rq.registry import FinishedJobRegistry
+from rq.results import Result
+from rq.utils import now, utcformat
+
+FINISHED_QUEUE = "bench-finished"
+BATCH_SIZE = 5000
+
+SHAPES = {
+    "small": dict(queues=50, queued_per_queue=10, finished=10000, workers=50, large_results=5, result_size=1 << 20),
+    "full": dict(queues=1000, queued_per_queue=10, finished=1000000, workers=2000, large_results=20, result_size=1 << 20),
+}
+
+
+def template_job(connection, queue_name):
+    """Return the DUMP payload of a freshly enqueued job, then delete the job."""
+    queue = Queue(queue_name, connection=connection)
+    job = queue.enqueue("os.path.exists", "/")
+    payload = connection.dump(job.key)
+    job.delete()
+    connection.srem(Queue.redis_queues_keys, queue.key)
+    return payload
+
+
+def restore_jobs(connection, entries, **fields):
+    """``RESTORE`` ``(key, ttl, payload)`` entries in pipelined batches, then set ``fields``."""
+    pipe = connection.pipeline(transaction=False)
+    for n, (key, ttl, payload) in enumerate(entries, 1):
+        pipe.restore(key, ttl, payload, replace=True)
+        if fields:
+            pipe.hset(key, mapping=fields)
+        if n % BATCH_SIZE == 0:
+            pipe.execute()
+    pipe.execute()
+
+
+def seed_queues(connection, queues, queued_per_queue):
+    payload = template_job(connection, "bench-queue")
+    for n in range(queues):
+        queue = Queue("bench-queue-{:05d}".format(n), connection=connection)
+        job_ids = [str(uuid.uuid4()) for _ in range(queued_per_queue)]
+        restore_jobs(connection, ((Job.key_for(job_id), 0, payload) for job_id in job_ids), origin=queue.name)
+        if job_ids:
+            connection.rpush(queue.key, *job_ids)
+        connection.sadd(Queue.redis_queues_keys, queue.key)
+
+
+def seed_finished(connection, finished):
+    """Restore ``finished`` jobs into the finished registry of ``FINISHED_QUEUE``.
+
+    Scores are spread over the result TTL, as if the jobs finished at a
+    steady rate and none expired yet.
+    """
+    payload = template_job(connection, FINISHED_QUEUE)
+    registry = FinishedJobRegistry(FINISHED_QUEUE, connection=connection)
+    connection.sadd(Queue.redis_queues_keys, Queue(FINISHED_QUEUE, connection=connection).key)
+    expires_at = time.time() + DEFAULT_RESULT_TTL
+    for start in range(0, finished, BATCH_SIZE):
+        job_ids = [str(uuid.uuid4()) for _ in range(min(BATCH_SIZE, finished - start))]
+        restore_jobs(connection, ((Job.key_for(job_id), 0, payload) for job_id in job_ids), status="finished")
+        connection.zadd(
+            registry.key,
+            {job_id: expires_at - DEFAULT_RESULT_TTL * (start + n) / finished for n, job_id in enumerate(job_ids)},
+        )
+
+
+def seed_large_results(connection, large_results, result_size):
+    """Create finished jobs whose result is ``result_size`` bytes; return their ids."""
+    queue = Queue(FINISHED_QUEUE, connection=connection)
+    job_ids = []
+    for _ in range(large_results):
+        job = queue.enqueue("os.path.exists", "/")
+        Result.create(job, Result.Type.SUCCESSFUL, ttl=DEFAULT_RESULT_TTL, return_value="x" * result_size)
+        queue.remove(job)
+        job.set_status("finished")
+        job_ids.append(job.id)
+    return job_ids
+
+
+def seed_workers(connection, workers):
+    pipe = connection.pipeline(transaction=False)
+    timestamp = utcformat(now())
+    for n in range(workers):
+        name = "bench-worker-{:05d}".format(n)
+        key = Worker.redis_worker_namespace_prefix + name
+        queue_name = "bench-queue-{:05d}".format(n % 1000)
+        pipe.hset(
+            key,
+            mapping=dict(
+                birth=timestamp,
+                last_heartbeat=timestamp,
+                queues=queue_name,
+                pid=n,
+                hostname="bench",
+                state="idle" if n % 4 else "busy",
+                successful_job_count=n,
+                failed_job_count=n // 10,
+                total_working_time=n * 1.5,
+                version="bench",
+                python_version="bench",
+            ),
+        )
+        pipe.sadd(Worker.redis_workers_keys, key)
+        pipe.sadd(Worker.redis_workers_keys + ":" + queue_name, key)
+        if n % BATCH_SIZE == 0:
+            pipe.execute()
+    pipe.execute()
+
+
+def seed(connection, queues, queued_per_queue, finished, workers, large_results, result_size):
+    """Flush the database of ``connection`` and seed it; return the large result job ids."""
+    connection.flushdb()
+    seed_queues(connection, queues, queued_per_queue)
+    seed_finished(connection, finished)
+    seed_workers(connection, workers)
+    return seed_large_results(connection, large_results, result_size)